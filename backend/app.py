@@ -1,19 +1,33 @@
 # ---------------------------
 # backend/app.py
 # ---------------------------
+import io
 import os
 import platform
+import queue
+import re
+import stat
+import struct
 import subprocess
+import threading
+import time
 import urllib.parse
-import tempfile
-import shutil
+from collections import deque
+from contextlib import asynccontextmanager
+import zipfile
+import zlib
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from typing import Optional, List, Dict, Iterator
-from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, Query
+from anyio import CapacityLimiter, to_thread
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+import orjson
+from fastapi.responses import ORJSONResponse, HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -27,20 +41,59 @@ from .config import (
     PARENT_ORDER,
     # NEW: report config
     MULTI_EXP_LIMIT,
-    REPORTS_OUTPUT_DIR,
     DOCX_REPORT_BASENAME,
     DOCX_REPORT_AUTHOR,
+    DEDUP_BY_INODE,
+    CACHE_TTL_SECONDS,
+    CACHE_MAX_ENTRIES,
+    WALK_THREADS,
+    EXPAND_THREADS,
+    BROWSE_CACHE_TTL_SECONDS,
+    BROWSE_CURSOR_TTL_SECONDS,
+    INDEX_REFRESH_SECONDS,
 )
-from .search import walk_search, coverage_rows
+from .search import walk_search, coverage_rows, iter_search_hits, _excluded_dir
 from .search import monthly_coverage  # monthly data
 from .search import multi_exp_missing  # NEW: multi-EXP summary
-from .indexer import search_index  # optional
+from .indexer import search_index, list_under, index_ready, index_built_at  # optional
+from .indexer import start_index_refresher, stop_index_refresher
 from .mime_types import guess_type
+from .responses import conditional_file_response
+from .cache import TTLCache
 
 APP_DIR = Path(__file__).resolve().parent
 FRONTEND_DIR = APP_DIR.parent / "frontend"
 
-app = FastAPI(title="Smart Document Finder", version="2.2.0")
+# Repeated coverage queries (same filters) are served from memory for a short TTL
+_coverage_cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+# Folder-tree expansions (short TTL: the tree should still reflect new folders quickly)
+_children_cache = TTLCache(maxsize=4096, ttl=BROWSE_CACHE_TTL_SECONDS)
+_has_children_cache = TTLCache(maxsize=16384, ttl=BROWSE_CACHE_TTL_SECONDS)
+_list_cache = TTLCache(maxsize=256, ttl=BROWSE_CACHE_TTL_SECONDS)
+# Paused /browse-list walks, keyed by where the next page starts. Expired or
+# evicted ones are closed right away: closing stops their scan pool.
+_list_cursors = TTLCache(
+    maxsize=32, ttl=BROWSE_CURSOR_TTL_SECONDS, on_evict=lambda cursor: cursor.close()
+)
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Background index refresh runs for the app's lifetime
+    if USE_INDEX:
+        start_index_refresher(str(DB_PATH), ALLOWED_ROOTS, INDEX_REFRESH_SECONDS)
+    try:
+        yield
+    finally:
+        stop_index_refresher()
+
+
+app = FastAPI(
+    title="Smart Document Finder",
+    version="2.2.0",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
+)
 
 # ---- CORS ----
 app.add_middleware(
@@ -51,6 +104,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---- GZip (JSON/HTML only) ----
+class _SelectiveGZipMiddleware:
+    """
+    GZip for API/HTML responses. File and streaming endpoints pass through:
+    compressing PDFs/zips is wasted CPU, would break Range/zero-copy sends,
+    and would hold back NDJSON lines inside the compressor.
+    """
+
+    def __init__(self, app, skip_paths, **gzip_kwargs):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **gzip_kwargs)
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["path"] not in self.skip_paths
+            and not _streaming_request(scope)
+        ):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+# Values FastAPI (pydantic) parses as True for a bool query parameter
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+
+
+def _streaming_request(scope) -> bool:
+    # stream=<true> as the endpoint will parse it (NDJSON response), from the
+    # parsed query string rather than a substring of it
+    qs = scope.get("query_string", b"")
+    if b"stream" not in qs:
+        return False
+    pairs = urllib.parse.parse_qsl(qs.decode("latin-1"), keep_blank_values=True)
+    return any(k == "stream" and v.strip().lower() in _TRUE_VALUES for k, v in pairs)
+
+
+app.add_middleware(
+    _SelectiveGZipMiddleware,
+    skip_paths=("/preview", "/browse-ui", "/zip-folder", "/coverage-files", "/multi-missing-docx"),
+    minimum_size=1024,
+    compresslevel=4,
+)
+
 # ---- Health ----
 @app.get("/health")
 def health():
@@ -58,106 +156,127 @@ def health():
 
 
 # ---- Helpers ----
-def _path_allowed(p: Path) -> bool:
+def _norm_root(root: str) -> str:
+    # normalized absolute root, always ending in exactly one separator
+    return os.path.normcase(os.path.abspath(root)).rstrip(os.sep) + os.sep
+
+
+# Built once at import; ALLOWED_ROOTS is a config constant
+_NORM_ROOTS = tuple(_norm_root(r) for r in ALLOWED_ROOTS)
+
+
+@lru_cache(maxsize=4096)
+def _path_allowed(path_str: str) -> bool:
     """
     Ensure the requested path is within one of the allowed roots.
     Works across different path casing and UNC/drive forms.
+    Cached on the raw path string (safe: ALLOWED_ROOTS is fixed per process).
+    A single C-level startswith() against the pre-normalized root tuple;
+    the trailing separator keeps "Unit 1" from matching "Unit 10".
+    (Compared as str on purpose: startswith is already a memcmp per root, and
+    encoding to bytes first would only add an allocation per call.)
     """
     try:
-        rp = os.path.normcase(os.path.abspath(str(p)))
+        rp = os.path.normcase(os.path.abspath(path_str))
     except Exception:
         return False
+    return (rp + os.sep).startswith(_NORM_ROOTS)
 
-    for root in ALLOWED_ROOTS:
-        try:
-            base = os.path.normcase(os.path.abspath(root))
-            if os.path.commonpath([rp, base]) == base:
-                return True
-        except Exception:
-            continue
-    return False
+
+def _base_name(path_str: str) -> str:
+    # Path(...).name without the Path: tolerant of trailing separators
+    return os.path.basename(os.path.normpath(path_str))
 
 
 def _dedup_key(path_str: str) -> str:
     """
-    Build a robust identity key for a path: prefer (st_dev, st_ino),
-    fall back to normalized absolute path.
+    Strict identity key (DEDUP_BY_INODE=True): prefer (st_dev, st_ino) so
+    junctions/aliases collapse, fall back to the normalized absolute path.
     """
-    p = Path(path_str)
     try:
-        st = p.stat()
+        st = os.stat(path_str)
         return f"{st.st_dev}:{st.st_ino}"
     except Exception:
-        try:
-            return os.path.normcase(os.path.abspath(str(p)))
-        except Exception:
-            return str(p).lower()
-
-
-def _fmt_size(n: Optional[int]) -> Optional[str]:
-    if n is None:
-        return None
+        pass
     try:
-        n = int(n)
+        return os.path.normcase(os.path.abspath(path_str))
     except Exception:
-        return None
-    units = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    f = float(n)
-    while f >= 1024 and i < len(units) - 1:
-        f /= 1024.0
-        i += 1
-    return f"{f:.1f} {units[i]}"
+        return path_str.lower()
 
 
-def _fmt_mtime(ts: Optional[float]) -> Optional[str]:
-    try:
-        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
-    except Exception:
-        return None
+def _has_children(dir_path: str) -> bool:
+    # Tree UIs re-expand the same nodes constantly: memoize probes briefly
+    return _has_children_cache.get_or_compute(
+        os.path.normcase(dir_path), lambda: _probe_has_children(dir_path)
+    )
 
 
-def _has_children(dir_path: Path) -> bool:
+def _probe_has_children(dir_path: str) -> bool:
     try:
         with os.scandir(dir_path) as it:
             for entry in it:
+                # returns on the first subfolder: no full listing of big folders
                 try:
                     if entry.is_dir(follow_symlinks=False):
                         return True
-                except PermissionError:
+                except OSError:
                     continue
-    except PermissionError:
+    except OSError:  # denied, vanished, or the share dropped: render as a leaf
         return False
     return False
 
 
+_walk_limiter: Optional[CapacityLimiter] = None
+
+
+async def _offload(fn, *args, **kwargs):
+    """
+    Run a blocking filesystem walk on a worker thread.
+    Walks get their own bounded limiter so they can't starve the default
+    thread pool (preview/health stay responsive during heavy scans).
+    """
+    global _walk_limiter
+    if _walk_limiter is None:
+        _walk_limiter = CapacityLimiter(WALK_THREADS)
+    return await to_thread.run_sync(partial(fn, *args, **kwargs), limiter=_walk_limiter)
+
+
 # =========================================================
 #  A) BASELINE SEARCH
 # =========================================================
 @app.get("/search")
-def search(
+async def search(
     query: str = Query(..., min_length=1, description="Filename-only, case-insensitive substring"),
     year: Optional[str] = Query(None),
     month: Optional[str] = Query(None),
     company: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="next_cursor from the previous page (index only)"),
+    exact_count: bool = Query(True, description="False: walk may stop early, count becomes a lower bound (no index only)"),
 ):
-    if USE_INDEX:
-        res = search_index(
+    next_cursor = None
+    count_is_lower_bound = False
+    if USE_INDEX and index_ready():
+        res = await _offload(
+            search_index,
             db_path=str(DB_PATH),
             query=query,
+            roots=ALLOWED_ROOTS,
             year=year,
             month=month,
             company=company,
             page=page,
             page_size=page_size,
+            after=after,
         )
         total = res.get("count", 0)
         total_pages = res.get("total_pages", 1)
         items = res.get("items", [])
+        next_cursor = res.get("next_cursor")
     else:
-        res = walk_search(
+        res = await _offload(
+            walk_search,
             query=query,
             roots=ALLOWED_ROOTS,
             year=year,
@@ -165,17 +284,21 @@ def search(
             company=company,
             page=page,
             page_size=page_size,
+            exact_count=exact_count,
         )
         total = res.get("count", 0)
         total_pages = res.get("total_pages", 1)
         items = res.get("items", [])
+        count_is_lower_bound = res.get("count_is_lower_bound", False)
 
-    return JSONResponse({
+    return ORJSONResponse({
         "count": total,
         "page": page,
         "page_size": page_size,
         "total_pages": total_pages,
         "items": items,
+        "next_cursor": next_cursor,
+        "count_is_lower_bound": count_is_lower_bound,
     })
 
 
@@ -183,25 +306,26 @@ def search(
 #  B) COVERAGE ROWS (single table: exactly 7 parents)
 # =========================================================
 @app.get("/coverage-rows")
-def coverage_rows_endpoint(
+async def coverage_rows_endpoint(
     query: str = Query(..., min_length=1),
     year: Optional[str] = Query(None),
     month: Optional[str] = Query(None),
     company: Optional[str] = Query(None),
 ):
-    res = coverage_rows(
+    key = ("rows", query.strip().lower(), year, (month or "").lower(), (company or "").lower())
+    res = await _offload(_coverage_cache.get_or_compute, key, lambda: coverage_rows(
         parents_order=PARENT_ORDER,
         roots=ALLOWED_ROOTS,
         query=query,
         year=year,
         month=month,
         company=company,
-    )
-    return JSONResponse(res)
+    ))
+    return ORJSONResponse(res)
 
 
 @app.get("/coverage-files")
-def coverage_files_endpoint(
+async def coverage_files_endpoint(
     parent: str = Query(..., description="One of the fixed parent names (e.g., 'CIPL')"),
     query: str = Query(..., min_length=1),
     year: Optional[str] = Query(None),
@@ -213,61 +337,148 @@ def coverage_files_endpoint(
       - If a search hit is a FILE, include it directly.
       - If a search hit is a FOLDER (e.g., 'EXP-192'), enumerate files inside it
         so Preview works. (Expands up to max_depth and returns files.)
+
+    Streams NDJSON (one item per line) so rows render before the walk finishes:
+    without the index, hits come in walk order as they are found (the page
+    keeps its table sorted as rows arrive).
     """
-    res = walk_search(
-        query=query or "",
-        roots=ALLOWED_ROOTS,
-        year=year,
-        month=month,
-        company=company,
-        page=1,
-        page_size=10_000,
-    )
+    gen = _iter_coverage_files(parent, query, year, month, company)
+    return StreamingResponse(_ndjson_stream(gen), media_type="application/x-ndjson")
 
-    wanted = (parent or "").strip().lower()
-    items_out: List[Dict] = []
 
-    for item in res.get("items", []):
-        kind = (item.get("kind") or "file").lower()
-        full_path = Path(item.get("full_path", ""))
+async def _ndjson_stream(gen: Iterator[Dict], batch: int = 200, first_batch: int = 16):
+    """
+    Pull items from a blocking generator on the walk pool and emit them as
+    NDJSON lines. A chunk closes at `batch` items (`first_batch` for the first
+    one) or once _NDJSON_FLUSH_SECONDS have passed, so the first rows of a slow
+    walk show up right away instead of after a full batch.
+    """
+    size = first_batch
+    while True:
+        chunk = await _offload(_take_chunk, gen, size, _NDJSON_FLUSH_SECONDS)
+        if not chunk:
+            break
+        yield b"".join(orjson.dumps(it) + b"\n" for it in chunk)
+        size = batch
+
 
-        parent_name = full_path.parent.name.lower()
+# Longest an NDJSON chunk waits for more items (checked as each item arrives)
+_NDJSON_FLUSH_SECONDS = 0.1
 
-        # Only keep entries belonging to the requested parent
-        if parent_name != wanted:
-            if wanted not in [p.lower() for p in full_path.parts]:
-                continue
 
-        if kind == "file":
-            items_out.append({
-                "kind": "file",
-                "file_name": item.get("file_name") or full_path.name,
-                "parent_folder": full_path.parent.name,
-                "full_path": str(full_path),
-            })
-        else:
-            if not _path_allowed(full_path):
-                continue
-            items_out.extend(_list_files_in_folder(full_path, max_depth=2, limit=500))
+def _take_chunk(gen: Iterator[Dict], size: int, budget: float) -> List[Dict]:
+    chunk = []
+    deadline = time.monotonic() + budget
+    for item in gen:
+        chunk.append(item)
+        if len(chunk) >= size or time.monotonic() >= deadline:
+            break
+    return chunk
+
 
-    # De-duplicate by robust file identity (device+inode) or normalized path
+def _iter_coverage_files(
+    parent: str,
+    query: str,
+    year: Optional[str],
+    month: Optional[str],
+    company: Optional[str],
+) -> Iterator[Dict]:
+    wanted = (parent or "").strip().lower()
+    if not wanted:
+        return
+
+    # Parent filter is pushed into the query/walk: only hits under `wanted` come back
+    hits = _coverage_hits(wanted, query, year, month, company)
+
+    # De-duplicate while producing: the normalized path string itself is the key
+    # (no stat); device+inode identity only when DEDUP_BY_INODE is enabled
     seen = set()
-    deduped = []
-    for it in items_out:
-        key = _dedup_key(it["full_path"])
+    normcase, abspath = os.path.normcase, os.path.abspath
+
+    def fresh(it: Dict) -> bool:
+        fp = it["full_path"]
+        key = _dedup_key(fp) if DEDUP_BY_INODE else normcase(abspath(fp))
         if key in seen:
-            continue
+            return False
         seen.add(key)
-        deduped.append(it)
-
-    return {"items": deduped}
+        return True
+
+    def emit(hit) -> Iterator[Dict]:
+        kind, val = hit
+        files = [val] if kind == "file" else val.result()
+        for it in files:
+            if fresh(it):
+                yield it
+
+    # Folder hits are expanded concurrently as they arrive: on a network share
+    # each scandir is a round-trip, so overlapping them hides the latency.
+    # Hits are emitted in arrival order; a folder only holds back the rows
+    # behind it while its expansion runs and the window isn't full.
+    window = EXPAND_THREADS * 2
+    pending = deque()
+    pool = None
+    try:
+        for item in hits:
+            kind = (item.get("kind") or "file").lower()
+            fp = item.get("full_path", "")
+            if kind == "file":
+                pending.append(("file", {
+                    "kind": "file",
+                    "file_name": item.get("file_name") or os.path.basename(fp),
+                    # search rows already carry the containing folder's name
+                    "parent_folder": item.get("parent_folder") or os.path.basename(os.path.dirname(fp)),
+                    "full_path": fp,
+                }))
+            elif _path_allowed(fp):
+                if pool is None:
+                    pool = ThreadPoolExecutor(max_workers=EXPAND_THREADS)
+                pending.append(("folder", pool.submit(_list_files_in_folder, fp, max_depth=2, limit=500)))
+            while pending and (pending[0][0] == "file" or pending[0][1].done() or len(pending) > window):
+                yield from emit(pending.popleft())
+        while pending:
+            yield from emit(pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Search hits expanded per /coverage-files request
+_COVERAGE_HITS_MAX = 10_000
+
+
+def _coverage_hits(
+    wanted: str,
+    query: str,
+    year: Optional[str],
+    month: Optional[str],
+    company: Optional[str],
+) -> Iterator[Dict]:
+    if USE_INDEX and index_ready():
+        # one query: already fast, keeps the sorted order
+        res = search_index(
+            str(DB_PATH),
+            query=query or "",
+            roots=ALLOWED_ROOTS,
+            year=year,
+            month=month,
+            company=company,
+            page=1,
+            page_size=_COVERAGE_HITS_MAX,
+            parent_filter=wanted,
+        )
+        return iter(res.get("items", []))
+    # Walk hits as they are found (walk order), not after a full walk and sort
+    return islice(
+        iter_search_hits(query or "", ALLOWED_ROOTS, year, month, company, parent_filter=wanted),
+        _COVERAGE_HITS_MAX,
+    )
 
 
 # =========================================================
 #  B2) MONTHLY COVERAGE (Available vs Missing by parent)
 # =========================================================
 @app.get("/monthly-coverage")
-def monthly_coverage_endpoint(
+async def monthly_coverage_endpoint(
     year: str = Query(..., description="Year (e.g., 2025)"),
     month: str = Query(..., description="Full month name (e.g., August)"),
     company: Optional[str] = Query(None),
@@ -280,57 +491,69 @@ def monthly_coverage_endpoint(
         "missing":   [ "DOCK AUDIT REPORT", "BL", ... ]
       }
     """
-    res = monthly_coverage(
+    key = ("monthly", year, month.lower(), (company or "").lower())
+    res = await _offload(_coverage_cache.get_or_compute, key, lambda: monthly_coverage(
         parents_order=PARENT_ORDER,
         roots=ALLOWED_ROOTS,
         year=year,
         month=month,
         company=company,
         max_items_per_parent=5000,
-    )
-    return JSONResponse(res)
+    ))
+    return ORJSONResponse(res)
 
 
 # =========================================================
 #  C) PREVIEW / BASIC BROWSE
 # =========================================================
 @app.get("/preview")
-def preview(path: str):
-    p = Path(path)
-    if not _path_allowed(p):
+def preview(path: str, request: Request):
+    """
+    Inline file preview. Sends ETag/Last-Modified, answers If-None-Match with 304
+    and honors a single Range (PDF viewers seek without refetching).
+    """
+    if not _path_allowed(path):
         raise HTTPException(status_code=403, detail="Path not allowed")
-    if not p.exists():
-        raise HTTPException(status_code=404, detail="File not found")
 
-    media_type = guess_type(str(p))
-    headers = {"Content-Disposition": f'inline; filename="{p.name}"'}
-    return FileResponse(str(p), media_type=media_type, headers=headers)
+    media_type = guess_type(path)
+    headers = {"Content-Disposition": f'inline; filename="{_base_name(path)}"'}
+    return conditional_file_response(request, path, media_type, headers)
 
 
 @app.get("/browse")
-def browse(path: str, query: Optional[str] = None):
+async def browse(path: str, query: Optional[str] = None):
     """
     JSON API for programmatic listing (immediate children).
     """
-    p = Path(path)
-    if not _path_allowed(p):
+    return await _offload(_browse, path, query)
+
+
+def _browse(path: str, query: Optional[str]) -> Dict:
+    if not _path_allowed(path):
         raise HTTPException(status_code=403, detail="Path not allowed")
-    if not p.exists() or not p.is_dir():
+    if not os.path.isdir(path):
         raise HTTPException(status_code=404, detail="Folder not found")
 
-    ql = (query or "").lower()
+    match = re.compile(re.escape(query), re.IGNORECASE).search if query else None
+    parent_name = _base_name(path)
     items = []
     try:
-        for child in p.iterdir():
-            name = child.name
-            if ql and ql not in name.lower():
-                continue
-            items.append({
-                "kind": "folder" if child.is_dir() else "file",
-                "file_name": name,
-                "parent_folder": p.name,
-                "full_path": str(child),
-            })
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                if match and not match(name):
+                    continue
+                # DirEntry caches the d_type from readdir -> no extra stat per child
+                try:
+                    kind = "folder" if entry.is_dir(follow_symlinks=False) else "file"
+                except OSError:
+                    kind = "file"
+                items.append({
+                    "kind": kind,
+                    "file_name": name,
+                    "parent_folder": parent_name,
+                    "full_path": entry.path,
+                })
     except PermissionError:
         raise HTTPException(status_code=403, detail="Permission denied when listing folder")
 
@@ -341,141 +564,396 @@ def browse(path: str, query: Optional[str] = None):
 #  D) RICH BROWSER ENDPOINTS (tree + details)
 # =========================================================
 @app.get("/browse-children")
-def browse_children(path: str = Query(...)):
+async def browse_children(path: str = Query(...), lazy: bool = Query(False)):
     """
     Return immediate *folders* of a path, with has_children flag for each.
+    lazy=true skips the per-folder probes and reports has_children=True for all
+    (the client finds out on expand).
     """
-    base = Path(path)
+    base = os.path.normpath(path)
     if not _path_allowed(base):
         raise HTTPException(status_code=403, detail="Path not allowed")
-    if not base.exists() or not base.is_dir():
+
+    # Short, latency-bound work: default thread pool (walks have their own limiter),
+    # isdir + listing in a single hop
+    items = await to_thread.run_sync(_children_listing, base, lazy)
+    return ORJSONResponse(
+        {"items": items},
+        headers={"Cache-Control": f"private, max-age={int(BROWSE_CACHE_TTL_SECONDS)}"},
+    )
+
+
+def _children_listing(base: str, lazy: bool) -> List[Dict]:
+    if not os.path.isdir(base):
         raise HTTPException(status_code=404, detail="Folder not found")
+    return _children_cache.get_or_compute(
+        (os.path.normcase(base), lazy), lambda: _list_child_folders(base, probe=not lazy)
+    )
+
 
+def _list_child_folders(base: str, probe: bool = True) -> List[Dict]:
     out = []
     try:
         with os.scandir(base) as it:
             for entry in it:
                 try:
                     if entry.is_dir(follow_symlinks=False):
-                        fp = Path(entry.path)
                         out.append({
                             "name": entry.name,
-                            "full_path": str(fp),
-                            "has_children": _has_children(fp),
+                            "full_path": entry.path,
                         })
                 except PermissionError:
                     continue
     except PermissionError:
         raise HTTPException(status_code=403, detail="Permission denied when listing folder")
 
+    # One has_children probe per subfolder; run them concurrently (SMB round-trips)
+    if not probe:
+        flags = [True] * len(out)
+    elif len(out) > 1:
+        with ThreadPoolExecutor(max_workers=min(WALK_THREADS, len(out))) as pool:
+            flags = list(pool.map(_has_children, [r["full_path"] for r in out]))
+    else:
+        flags = [_has_children(r["full_path"]) for r in out]
+    for r, flag in zip(out, flags):
+        r["has_children"] = flag
+
     out.sort(key=lambda r: r["name"].lower())
-    return {"items": out}
+    return out
+
+
+def _type_label(name: str) -> str:
+    # "PDF", "DOCX", ... for the Type column; "File" when there is no extension
+    return _ext_label(os.path.splitext(name)[1])
+
+
+@lru_cache(maxsize=512)
+def _ext_label(ext: str) -> str:
+    return ext[1:].upper() or "File"
+
+
+def _browse_sort_key(r: Dict):
+    # Folders first, then casefolded name (Unicode-correct, e.g. "ß" == "ss")
+    return (r["kind"] != "folder", r["name"].casefold())
 
 
-def _iter_items(root: Path, include_subfolders: bool) -> Iterator[Path]:
+def _entry_row(entry: os.DirEntry) -> Dict:
+    # DirEntry caches both: one stat at most (none for the type on Windows)
+    try:
+        st = entry.stat()
+    except OSError:
+        st = None
+    try:
+        is_dir = entry.is_dir()
+    except OSError:
+        is_dir = False
+    return {
+        "name": entry.name,
+        "full_path": entry.path,
+        "kind": "folder" if is_dir else "file",
+        "type": "Folder" if is_dir else _type_label(entry.name),
+        "size": st.st_size if st and not is_dir else None,
+        "mtime": int(st.st_mtime) if st else None,
+    }
+
+
+def _iter_items(root: str, include_subfolders: bool) -> Iterator[os.DirEntry]:
+    # DirEntry (not Path) so callers reuse the cached type/stat info
     if not include_subfolders:
         try:
             with os.scandir(root) as it:
-                for entry in it:
-                    yield Path(entry.path)
+                yield from it
         except PermissionError:
             return
         return
 
     # deep
-    for dirpath, dirnames, filenames in os.walk(root):
-        pdir = Path(dirpath)
-        for d in dirnames:
-            yield pdir / d
-        for f in filenames:
-            yield pdir / f
+    yield from _parallel_scandir(root)
+
+
+def _parallel_scandir(root: str, workers: int = WALK_THREADS) -> Iterator[os.DirEntry]:
+    """
+    Yield every entry below `root`, scanning directories on a thread pool.
+    Directory scans run ahead concurrently (latency-bound on network shares),
+    but results are consumed in submission order, so the output order is
+    deterministic across calls (offset pagination stays stable).
+    Symlinked directories and excluded folders (_excluded_dir) are left out,
+    by the same rule as the index's listings, so both sources list the same set.
+    """
+    def scan(d: str):
+        try:
+            with os.scandir(d) as it:
+                entries = list(it)
+        except OSError:
+            return [], []
+        kept, subdirs = [], []
+        for e in entries:
+            try:
+                is_dir = e.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if e.is_symlink() or _excluded_dir(e.name):
+                    continue
+                subdirs.append(e.path)
+            kept.append(e)
+        return kept, subdirs
+
+    todo = deque([root])
+    inflight = deque()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while todo or inflight:
+            while todo and len(inflight) < workers * 2:
+                inflight.append(pool.submit(scan, todo.popleft()))
+            entries, subdirs = inflight.popleft().result()
+            todo.extend(subdirs)
+            yield from entries
+    finally:
+        # Caller may stop early (pagination): drop queued scans
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 @app.get("/browse-list")
-def browse_list(
+async def browse_list(
     path: str = Query(...),
     q: Optional[str] = Query(None),
     include_subfolders: bool = Query(False),
     offset: int = Query(0, ge=0),
     limit: int = Query(1000, ge=1, le=5000),
+    stream: bool = Query(False),
+    source: Optional[str] = Query(None, description="`source` of the previous page (keeps a listing on one source)"),
 ):
     """
     Return folders+files for the details pane (optionally recursive), with soft pagination.
+    stream=true: NDJSON rows in discovery order (unsorted) as they are found,
+    then one {"done": true, "has_more", "next_offset", "source"} line.
+    Every page reports its `source` ("index" or "walk"); the two list in
+    different orders, so "load more" sends it back and gets the same source.
     """
-    base = Path(path)
+    base = os.path.normpath(path)
     if not _path_allowed(base):
         raise HTTPException(status_code=403, detail="Path not allowed")
-    if not base.exists() or not base.is_dir():
-        raise HTTPException(status_code=404, detail="Folder not found")
 
-    ql = (q or "").lower()
-    rows: List[Dict] = []
+    # Compiled once: no lowered copy of every scanned name
+    match = re.compile(re.escape(q), re.IGNORECASE).search if q else None
+
+    if stream:
+        # isdir()/stat() are network round-trips on a share: walk pool as well
+        if not await _offload(os.path.isdir, base):
+            raise HTTPException(status_code=404, detail="Folder not found")
+        walk_key = (os.path.normcase(base), include_subfolders, (q or "").lower())
+        if await _offload(_listing_source, base, include_subfolders, source) == "index":
+            page = await _offload(_browse_list_page_indexed, base, walk_key[2], offset, limit)
+            if page is not None:
+                trailer = {"done": True, "has_more": page["has_more"],
+                           "next_offset": page["next_offset"], "source": "index"}
+                return StreamingResponse(
+                    _ndjson_stream(iter([*page["items"], trailer]), batch=64),
+                    media_type="application/x-ndjson",
+                )
+        entries = _resume_entries(walk_key, offset, base, include_subfolders, match)
+        return StreamingResponse(
+            _ndjson_stream(_browse_rows_stream(entries, offset, limit, walk_key), batch=64),
+            media_type="application/x-ndjson",
+        )
 
-    max_collect = offset + limit + 1
-    count_collected = 0
+    # Paging back and forth / re-opening a folder is served from memory briefly
+    walk_key = (os.path.normcase(base), include_subfolders, (q or "").lower())
+    page = await _offload(
+        _list_cache.get_or_compute,
+        (*walk_key, offset, limit, source),
+        lambda: _browse_list_page(walk_key, base, include_subfolders, match, offset, limit, source),
+    )
+    return ORJSONResponse(
+        page,
+        headers={"Cache-Control": f"private, max-age={int(BROWSE_CACHE_TTL_SECONDS)}"},
+    )
 
-    def push(p: Path):
-        nonlocal count_collected
-        name = p.name
-        if ql and ql not in name.lower():
-            return
-        count_collected += 1
-        if count_collected <= offset:
-            return
-        if len(rows) >= limit + 1:
-            return
 
-        try:
-            st = p.stat()
-        except PermissionError:
-            st = None
-
-        rows.append({
-            "name": name,
-            "full_path": str(p),
-            "kind": "folder" if p.is_dir() else "file",
-            "size": _fmt_size(st.st_size) if st and p.is_file() else None,
-            "modified": _fmt_mtime(st.st_mtime) if st else None,
-        })
-
-    collected = 0
-    for child in _iter_items(base, include_subfolders):
-        push(child)
-        collected += 1
-        if collected >= max_collect:
-            break
+def _listing_source(base: str, include_subfolders: bool, source: Optional[str]) -> str:
+    """
+    "index" or "walk" for a /browse-list page. A listing keeps the source of
+    its first page (`source` sent back by the client), so an offset always
+    indexes the order it came from. A new deep listing uses the index when it
+    is ready, unless `base` itself changed after the index build started; the
+    index can still miss changes deeper down until its next refresh
+    (INDEX_REFRESH_SECONDS).
+    """
+    if not include_subfolders or source == "walk" or not (USE_INDEX and index_ready()):
+        return "walk"
+    if source == "index":
+        return "index"
+    try:
+        changed = os.stat(base).st_mtime >= index_built_at()
+    except OSError:
+        changed = True
+    return "walk" if changed else "index"
 
-    rows.sort(key=lambda r: (r["kind"] != "folder", (r["name"] or "").lower()))
 
-    has_more = len(rows) > limit
+def _browse_list_page(
+    walk_key, base: str, include_subfolders: bool, match, offset: int, limit: int, source: Optional[str]
+) -> Dict:
+    if not os.path.isdir(base):
+        raise HTTPException(status_code=404, detail="Folder not found")
+    if _listing_source(base, include_subfolders, source) == "index":
+        page = _browse_list_page_indexed(base, walk_key[2], offset, limit)
+        if page is not None:
+            return page
+    entries = _resume_entries(walk_key, offset, base, include_subfolders, match)
+
+    # Stop on kept rows, not scanned entries: the walk only runs until the page (+1) fills
+    kept = list(islice(entries, limit + 1))
+
+    # The +1 is only a has_more probe: drop it in walk order (it opens the next
+    # page), so it is neither stat'ed nor sorted into this one
+    has_more = len(kept) > limit
     if has_more:
-        rows = rows[:limit]
+        _park_entries(walk_key, offset + limit, kept.pop(), entries)
+    else:
+        entries.close()
     next_offset = (offset + limit) if has_more else None
 
-    return {"items": rows, "has_more": has_more, "next_offset": next_offset}
+    # Stat only the page, in one concurrent batch (each stat is a round-trip on SMB)
+    if len(kept) > 1:
+        with ThreadPoolExecutor(max_workers=min(WALK_THREADS, len(kept))) as pool:
+            rows = list(pool.map(_entry_row, kept))
+    else:
+        rows = [_entry_row(e) for e in kept]
 
+    rows.sort(key=_browse_sort_key)
 
-# ---- Server-rendered folder UI (two-pane, with sidebar toggle) ----
-@app.get("/browse-ui", response_class=HTMLResponse)
-def browse_ui(path: str = Query(..., description="Absolute path under one of ALLOWED_ROOTS")):
+    return {"items": rows, "has_more": has_more, "next_offset": next_offset, "source": "walk"}
+
+
+def _browse_list_page_indexed(base: str, q: str, offset: int, limit: int) -> Optional[Dict]:
     """
-    Two-pane browser (tree + details). Uses /browse-children and /browse-list.
-    Raw HTML string with placeholders replaced.
+    Deep listing page from the SQLite index: one query instead of a tree walk.
+    Only the page's paths are stat'ed (live size/mtime; vanished files drop out).
+    None when the index knows nothing below `base` yet (new folder): caller walks.
     """
-    p = Path(path)
-    if not _path_allowed(p):
-        raise HTTPException(status_code=403, detail="Path not allowed")
-    if not p.exists():
-        raise HTTPException(status_code=404, detail="Not found")
-    if p.is_file():
-        media_type = guess_type(str(p))
-        headers = {"Content-Disposition": f'inline; filename="{p.name}"'}
-        return FileResponse(str(p), media_type=media_type, headers=headers)
+    paths = list_under(str(DB_PATH), base, q, offset, limit + 1)
+    if not paths and offset == 0:
+        return None
+
+    has_more = len(paths) > limit
+    del paths[limit:]
+    if len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(WALK_THREADS, len(paths))) as pool:
+            rows = [r for r in pool.map(_path_row, paths) if r is not None]
+    else:
+        rows = [r for r in map(_path_row, paths) if r is not None]
+    rows.sort(key=_browse_sort_key)
+    return {"items": rows, "has_more": has_more,
+            "next_offset": (offset + limit) if has_more else None, "source": "index"}
+
+
+def _path_row(full_path: str) -> Optional[Dict]:
+    try:
+        st = os.stat(full_path)
+    except OSError:
+        return None
+    is_dir = stat.S_ISDIR(st.st_mode)
+    return {
+        "name": os.path.basename(full_path),
+        "full_path": full_path,
+        "kind": "folder" if is_dir else "file",
+        "type": "Folder" if is_dir else _type_label(full_path),
+        "size": None if is_dir else st.st_size,
+        "mtime": int(st.st_mtime),
+    }
+
+
+def _resume_entries(walk_key, offset: int, base: str, include_subfolders: bool, match) -> "_WalkCursor":
+    """
+    Continue the walk a previous page paused at `offset`, if it is still parked;
+    otherwise start one and skip `offset` matches. "Load more" on a deep listing
+    then costs one page of scanning instead of a re-walk of everything before it.
+    """
+    cursor = _list_cursors.pop((*walk_key, offset))
+    if cursor is None:
+        return _WalkCursor(_matching_entries(base, include_subfolders, match, offset))
+    return cursor
+
+
+def _park_entries(walk_key, offset: int, probe: os.DirEntry, cursor: "_WalkCursor") -> None:
+    # `probe` was already pulled (has_more check): it opens the next page.
+    # The cursor wraps a started generator, so closing it (on expiry) stops its walk.
+    cursor.pending = probe
+    _list_cursors.put((*walk_key, offset), cursor)
+
+
+class _WalkCursor:
+    """
+    A paged walk: the matching-entries generator plus the entry pulled ahead as
+    the previous page's has_more probe. Resuming hands back this same object,
+    so page N reads the walk directly, not through N nested wrappers.
+    """
+
+    __slots__ = ("walk", "pending")
+
+    def __init__(self, walk: Iterator[os.DirEntry]):
+        self.walk = walk
+        self.pending: Optional[os.DirEntry] = None
 
-    allowed_roots_encoded = urllib.parse.quote("|".join(ALLOWED_ROOTS))
-    initial_path_encoded = urllib.parse.quote(str(p))
+    def __iter__(self) -> "_WalkCursor":
+        return self
 
-    html = r"""<!doctype html>
+    def __next__(self) -> os.DirEntry:
+        entry = self.pending
+        if entry is not None:
+            self.pending = None
+            return entry
+        return next(self.walk)
+
+    def close(self) -> None:
+        self.pending = None
+        self.walk.close()
+
+
+def _matching_entries(
+    base: str, include_subfolders: bool, match, offset: int
+) -> Iterator[os.DirEntry]:
+    # Entries passing the q filter, past the first `offset` matches.
+    # Filter and skip are C-level iterators; no per-entry branch without q.
+    walk = _iter_items(base, include_subfolders)
+    items = walk if match is None else (e for e in walk if match(e.name) is not None)
+    try:
+        yield from islice(items, offset, None)
+    finally:
+        walk.close()
+
+
+def _browse_rows_stream(
+    entries: _WalkCursor, offset: int, limit: int, walk_key, batch: int = 64
+) -> Iterator[Dict]:
+    # Rows go out in discovery order, `batch` entries at a time, each batch
+    # stat'ed concurrently like _browse_list_page (a stat is a round-trip on SMB)
+    sent = 0
+    has_more = False
+    pool = ThreadPoolExecutor(max_workers=WALK_THREADS)
+    try:
+        while sent < limit:
+            chunk = list(islice(entries, min(batch, limit - sent)))
+            if not chunk:
+                break
+            yield from pool.map(_entry_row, chunk)
+            sent += len(chunk)
+        if sent == limit:
+            probe = next(entries, None)
+            if probe is not None:
+                has_more = True
+                _park_entries(walk_key, offset + limit, probe, entries)
+    finally:
+        pool.shutdown(wait=False)
+        if not has_more:
+            entries.close()
+    yield {"done": True, "has_more": has_more,
+           "next_offset": (offset + limit) if has_more else None, "source": "walk"}
+
+
+# ---- Server-rendered folder UI (two-pane, with sidebar toggle) ----
+_BROWSE_UI_HTML = r"""<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
@@ -594,7 +1072,7 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
   const btnSidebar = $("#btnSidebar");
   const wrapEl = document.querySelector(".wrap");
 
-  let state = { currentPath: INITIAL_PATH, q: "", deep: false, nextOffset: 0, loading: false };
+  let state = { currentPath: INITIAL_PATH, q: "", deep: false, nextOffset: 0, source: null, loading: false };
 
   // sidebar toggle (persisted)
   function setSidebar(open){
@@ -642,7 +1120,14 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
     expandToPath(state.currentPath);
   }
 
-  async function expand(nodeEl) {
+  async function fetchChildren(path) {
+    const res = await fetch(`/browse-children?` + new URLSearchParams({ path }));
+    if (!res.ok) throw new Error("children " + res.status);
+    return res.json();
+  }
+
+  // prefetched: optional promise of the /browse-children payload (null = fetch now)
+  async function expand(nodeEl, prefetched) {
     const kids = nodeEl.nextElementSibling;
     if (kids.getAttribute("data-loaded") === "1") {
       const open = kids.style.display !== "none";
@@ -652,10 +1137,13 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
     }
     const path = nodeEl.getAttribute("data-path");
     try {
-      const res = await fetch(`/browse-children?` + new URLSearchParams({ path }));
-      if (!res.ok) throw new Error("children " + res.status);
-      const data = await res.json();
+      const data = (prefetched && await prefetched) || await fetchChildren(path);
       kids.innerHTML = "";
+      // Nothing below after all (lazy/stale flag): drop the twisty
+      if (!(data.items || []).length) {
+        const tw = nodeEl.querySelector(".twisty");
+        if (tw) tw.replaceWith(Object.assign(document.createElement("span"), { style: "display:inline-block;width:12px;" }));
+      }
       (data.items || []).forEach(item => {
         const li = document.createElement("li");
         li.innerHTML = nodeTemplate(item.name, item.full_path, false, item.has_children);
@@ -675,14 +1163,21 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
       normalizeSlashes(n.getAttribute("data-path")).toLowerCase()
     ));
     if (!rootNode) rootNode = roots[0];
-    await expand(rootNode);
 
     const base = normalizeSlashes(rootNode.getAttribute("data-path"));
     const segs = normalizeSlashes(targetPath).substring(base.length).replace(/^\\/, "").split(/\\+/).filter(Boolean);
-    let cur = rootNode;
-    let curPath = base;
+    const prefixes = [base];
     for (const seg of segs) {
-      curPath += (curPath.endsWith("\\") ? "" : "\\") + seg;
+      const prev = prefixes[prefixes.length - 1];
+      prefixes.push(prev + (prev.endsWith("\\") ? "" : "\\") + seg);
+    }
+    // Every level's children requested at once: one round-trip of latency, not one per level
+    const pending = prefixes.map(p => fetchChildren(p).catch(() => null));
+
+    await expand(rootNode, pending[0]);
+    let cur = rootNode;
+    for (let i = 0; i < segs.length; i++) {
+      const curPath = prefixes[i + 1];
       const kids = cur.nextElementSibling;
       let nextNode = [...kids.querySelectorAll(".node")].find(n => normalizeSlashes(n.getAttribute("data-path")).toLowerCase() === curPath.toLowerCase());
       if (!nextNode) {
@@ -690,7 +1185,7 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
         nextNode = [...kids.querySelectorAll(".node")].find(n => normalizeSlashes(n.getAttribute("data-path")).toLowerCase() === curPath.toLowerCase());
       }
       if (!nextNode) break;
-      await expand(nextNode);
+      await expand(nextNode, pending[i + 1]);
       cur = nextNode;
     }
     // highlight active
@@ -702,7 +1197,7 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
   async function loadList(reset=true) {
     if (state.loading) return;
     state.loading = true;
-    if (reset) { rowsEl.innerHTML = `<tr><td colspan="5" class="muted">Loading…</td></tr>`; state.nextOffset = 0; }
+    if (reset) { rowsEl.innerHTML = `<tr><td colspan="5" class="muted">Loading…</td></tr>`; state.nextOffset = 0; state.source = null; }
 
     try {
       const params = new URLSearchParams({
@@ -710,21 +1205,34 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
         include_subfolders: String(state.deep),
         offset: String(state.nextOffset || 0),
         limit: "1000",
+        stream: "true",
       });
       if (state.q) params.set("q", state.q);
+      // later pages stay on the source (index/walk) the first page came from
+      if (state.source) params.set("source", state.source);
 
       const res = await fetch(`/browse-list?` + params.toString());
       if (!res.ok) throw new Error("list " + res.status);
-      const data = await res.json();
-      const items = data.items || [];
-      if (reset) rowsEl.innerHTML = "";
-      if (!items.length && (state.nextOffset || 0) === 0) {
+
+      // Rows render as the server finds them; the page is sorted once complete
+      const page = [];
+      let data = {};
+      let cleared = !reset;
+      await readNdjson(res, obj => {
+        if (obj.done) { data = obj; return; }
+        if (!cleared) { rowsEl.innerHTML = ""; cleared = true; }
+        page.push(addRow(obj));
+      });
+      if (!cleared) rowsEl.innerHTML = "";
+      if (!page.length && (state.nextOffset || 0) === 0) {
         rowsEl.innerHTML = `<tr><td colspan="5"><div class="muted">Empty folder</div></td></tr>`;
       } else {
-        items.forEach(addRow);
+        page.sort((a, b) => (a.isFile - b.isFile) || (a.key < b.key ? -1 : a.key > b.key ? 1 : 0));
+        page.forEach(r => rowsEl.appendChild(r.tr));
       }
 
       state.nextOffset = data.has_more ? (data.next_offset || 0) : null;
+      state.source = data.source || null;
       moreWrap.style.display = data.has_more ? "block" : "none";
       moreInfo.textContent = data.has_more ? "Showing first 1000 items…" : "";
     } catch(e) {
@@ -732,9 +1240,35 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
     } finally { state.loading = false; }
   }
 
+  async function readNdjson(res, onObj) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buf = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      buf += decoder.decode(value || new Uint8Array(), { stream: !done });
+      const lines = buf.split("\n");
+      buf = done ? "" : lines.pop();
+      lines.filter(Boolean).forEach(line => onObj(JSON.parse(line)));
+      if (done) break;
+    }
+  }
+
+  // Rows carry raw bytes / epoch seconds; formatted here (same style as before)
+  const SIZE_UNITS = ["B", "KB", "MB", "GB", "TB"];
+  function fmtSize(n) {
+    let f = n, i = 0;
+    while (f >= 1024 && i < SIZE_UNITS.length - 1) { f /= 1024; i++; }
+    return f.toFixed(1) + " " + SIZE_UNITS[i];
+  }
+  const pad2 = n => String(n).padStart(2, "0");
+  function fmtTime(ts) {
+    const d = new Date(ts * 1000);
+    return `${d.getFullYear()}-${pad2(d.getMonth() + 1)}-${pad2(d.getDate())} ${pad2(d.getHours())}:${pad2(d.getMinutes())}`;
+  }
+
   function addRow(it) {
     const isFolder = it.kind === "folder";
-    const type = isFolder ? "Folder" : (it.name.split(".").pop().toUpperCase());
     const openHref = isFolder
       ? `/browse-ui?path=${encodeURIComponent(it.full_path)}`
       : `/preview?path=${encodeURIComponent(it.full_path)}`;
@@ -753,12 +1287,13 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
     const tr = document.createElement("tr");
     tr.innerHTML = `
       <td>${escapeHtml(it.name || "")}</td>
-      <td class="nowrap">${type || "—"}</td>
-      <td class="nowrap">${it.size || "—"}</td>
-      <td class="nowrap">${it.modified || "—"}</td>
+      <td class="nowrap">${escapeHtml(it.type || "—")}</td>
+      <td class="nowrap">${it.size == null ? "—" : fmtSize(it.size)}</td>
+      <td class="nowrap">${it.mtime == null ? "—" : fmtTime(it.mtime)}</td>
       <td class="nowrap">${openCell}</td>
     `;
     rowsEl.appendChild(tr);
+    return { tr, isFile: isFolder ? 0 : 1, key: (it.name || "").toLowerCase() };
   }
 
   // Robust breadcrumbs (handles UNC shares and local drives)
@@ -834,23 +1369,227 @@ def browse_ui(path: str = Query(..., description="Absolute path under one of ALL
 </body>
 </html>
 """
-    html = html.replace("__ALLOWED_ROOTS__", allowed_roots_encoded).replace("__INITIAL_PATH__", initial_path_encoded)
-    return HTMLResponse(html)
+
+# Split once at import around the two placeholders; roots are a config constant
+_BROWSE_UI_A, _rest = _BROWSE_UI_HTML.split("__ALLOWED_ROOTS__", 1)
+_BROWSE_UI_B, _BROWSE_UI_C = _rest.split("__INITIAL_PATH__", 1)
+_BROWSE_UI_A, _BROWSE_UI_B, _BROWSE_UI_C = (x.encode("utf-8") for x in (_BROWSE_UI_A, _BROWSE_UI_B, _BROWSE_UI_C))
+_ALLOWED_ROOTS_ENCODED = urllib.parse.quote("|".join(ALLOWED_ROOTS)).encode("ascii")
+del _rest
+
+
+def _raw_deflate(data: bytes, final: bool) -> bytes:
+    # Raw deflate piece; a full flush ends it byte-aligned with no back-references
+    # out of it, so independently compressed pieces can be concatenated
+    c = zlib.compressobj(9, zlib.DEFLATED, -15)
+    return c.compress(data) + c.flush(zlib.Z_FINISH if final else zlib.Z_FULL_FLUSH)
+
+
+# Static parts compressed once at import; per request only the initial path is
+# deflated and the gzip trailer (CRC32 + length) is computed over the page
+_BROWSE_UI_HEAD = _BROWSE_UI_A + _ALLOWED_ROOTS_ENCODED + _BROWSE_UI_B
+_BROWSE_UI_HEAD_GZ = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff" + _raw_deflate(_BROWSE_UI_HEAD, final=False)
+_BROWSE_UI_HEAD_CRC = zlib.crc32(_BROWSE_UI_HEAD)
+_BROWSE_UI_TAIL_GZ = _raw_deflate(_BROWSE_UI_C, final=True)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Accept-Encoding negotiation with q-values: gzip (or x-gzip) listed with
+    q > 0, or not listed but covered by "*" with q > 0. "gzip;q=0" refuses it.
+    """
+    star = None
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            star = q > 0
+    return bool(star)
+
+
+def _browse_ui_gzip(initial_path_encoded: bytes) -> bytes:
+    crc = zlib.crc32(_BROWSE_UI_C, zlib.crc32(initial_path_encoded, _BROWSE_UI_HEAD_CRC))
+    size = len(_BROWSE_UI_HEAD) + len(initial_path_encoded) + len(_BROWSE_UI_C)
+    return b"".join((
+        _BROWSE_UI_HEAD_GZ,
+        _raw_deflate(initial_path_encoded, final=False),
+        _BROWSE_UI_TAIL_GZ,
+        struct.pack("<II", crc, size & 0xFFFFFFFF),
+    ))
+
+
+@app.get("/browse-ui", response_class=HTMLResponse)
+async def browse_ui(request: Request, path: str = Query(..., description="Absolute path under one of ALLOWED_ROOTS")):
+    """
+    Two-pane browser (tree + details). Uses /browse-children and /browse-list.
+    Template is split once at import; only the initial path is spliced in per request.
+    """
+    p = os.path.normpath(path)
+    if not _path_allowed(p):
+        raise HTTPException(status_code=403, detail="Path not allowed")
+    # One stat (off the event loop) answers exists/is-file and feeds the file response
+    try:
+        st = await to_thread.run_sync(os.stat, p)
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Permission denied")
+    except OSError:
+        raise HTTPException(status_code=404, detail="Not found")
+    if stat.S_ISREG(st.st_mode):
+        media_type = guess_type(p)
+        headers = {"Content-Disposition": f'inline; filename="{os.path.basename(p)}"'}
+        return conditional_file_response(request, p, media_type, headers, st=st)
+
+    initial_path_encoded = urllib.parse.quote(p).encode("ascii")
+    headers = {"Cache-Control": "public, max-age=300", "Vary": "Accept-Encoding"}
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        headers["Content-Encoding"] = "gzip"
+        return HTMLResponse(_browse_ui_gzip(initial_path_encoded), headers=headers)
+    html = b"".join((_BROWSE_UI_HEAD, initial_path_encoded, _BROWSE_UI_C))
+    return HTMLResponse(html, headers=headers)
 
 
 # ---- Optional zip (kept; not shown in UI now) ----
+# Already-compressed formats are stored as-is; deflating them burns CPU for ~0 gain
+_ZIP_STORED_EXTS = {
+    ".pdf", ".docx", ".xlsx", ".pptx", ".zip", ".7z", ".rar", ".gz",
+    ".jpg", ".jpeg", ".png", ".gif", ".tif", ".tiff",
+}
+_ZIP_CHUNK = 1024 * 1024
+
+
+class _ZipCancelled(Exception):
+    """The client went away: stops the archive writer."""
+
+
+class _ZipSink:
+    """
+    Write-only, non-seekable sink between the archive writer thread and the
+    response: writes are coalesced into _ZIP_CHUNK pieces on a bounded queue,
+    so the writer blocks (no buffering of whole files) while the client lags.
+    """
+
+    def __init__(self, max_chunks: int = 4):
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_chunks)
+        self.buf: List[bytes] = []
+        self.size = 0
+        self.cancelled = False
+        self.error: Optional[BaseException] = None
+
+    def write(self, b) -> int:
+        self.buf.append(bytes(b))
+        self.size += len(b)
+        if self.size >= _ZIP_CHUNK:
+            self._put(b"".join(self.buf))
+            self.buf.clear()
+            self.size = 0
+        return len(b)
+
+    def flush(self):
+        pass
+
+    def finish(self) -> None:
+        # last bytes (central directory), then the end marker
+        if self.buf:
+            self._put(b"".join(self.buf))
+            self.buf.clear()
+        self._put(None)
+
+    def _put(self, item: Optional[bytes]) -> None:
+        while True:
+            if self.cancelled:
+                raise _ZipCancelled()
+            try:
+                self.queue.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+
+
+def _write_zip(folder: str, sink: _ZipSink) -> None:
+    # Whole tree, .git and hidden folders included (the search exclusions don't
+    # apply to a download); symlinked folders are not followed.
+    try:
+        with zipfile.ZipFile(sink, "w") as zf:
+            for dirpath, _dirnames, filenames in os.walk(folder):
+                if dirpath != folder:
+                    # keep empty folders, like shutil.make_archive did
+                    try:
+                        info = zipfile.ZipInfo.from_file(dirpath, os.path.relpath(dirpath, folder))
+                    except OSError:
+                        pass
+                    else:
+                        zf.writestr(info, b"")
+                for name in filenames:
+                    full = os.path.join(dirpath, name)
+                    if os.path.splitext(name)[1].lower() in _ZIP_STORED_EXTS:
+                        kwargs = {"compress_type": zipfile.ZIP_STORED}
+                    else:
+                        kwargs = {"compress_type": zipfile.ZIP_DEFLATED, "compresslevel": 1}  # speed over ratio
+                    try:
+                        # stat + open happen before the member header is written
+                        zf.write(full, os.path.relpath(full, folder), **kwargs)
+                    except OSError:
+                        continue
+        sink.finish()
+    except _ZipCancelled:
+        pass
+    except BaseException as e:
+        sink.error = e
+        try:
+            sink._put(None)
+        except _ZipCancelled:
+            pass
+
+
+def _zip_stream(folder: str) -> Iterator[bytes]:
+    """
+    Build the archive on the fly: a writer thread compresses into the sink and
+    bytes go to the client as they are produced (no temp file, no wait for the
+    whole archive, memory bounded by the sink's queue).
+    """
+    sink = _ZipSink()
+    threading.Thread(target=_write_zip, args=(folder, sink), name="zip-folder", daemon=True).start()
+    try:
+        while True:
+            chunk = sink.queue.get()
+            if chunk is None:
+                break
+            yield chunk
+        if sink.error is not None:
+            raise sink.error
+    finally:
+        sink.cancelled = True
+
+
 @app.get("/zip-folder")
 def zip_folder(path: str = Query(..., description="Absolute folder path under allowed roots")):
     folder = Path(path)
-    if not _path_allowed(folder):
+    if not _path_allowed(str(folder)):
         raise HTTPException(status_code=403, detail="Path not allowed")
     if not folder.exists() or not folder.is_dir():
         raise HTTPException(status_code=404, detail="Folder not found")
 
-    tmpdir = Path(tempfile.mkdtemp())
-    zip_base = tmpdir / folder.name
-    shutil.make_archive(str(zip_base), "zip", folder)
-    return FileResponse(str(zip_base) + ".zip", filename=f"{folder.name}.zip")
+    filename = f"{folder.name}.zip"
+    quoted = urllib.parse.quote(filename)
+    if quoted != filename:
+        disposition = f"attachment; filename*=utf-8''{quoted}"
+    else:
+        disposition = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        _zip_stream(str(folder)),
+        media_type="application/zip",
+        headers={"Content-Disposition": disposition},
+    )
 
 
 # ---- Windows shell-open endpoints (compat) ----
@@ -862,36 +1601,85 @@ class ShellRequest(BaseModel):
 def shell_open(req: ShellRequest):
     if platform.system().lower() != "windows":
         raise HTTPException(status_code=501, detail="Open supported only on Windows")
-    p = Path(req.path)
-    if not _path_allowed(p):
+    path = req.path
+    if not _path_allowed(path):
         raise HTTPException(status_code=403, detail="Path not allowed")
-    if not p.exists():
+    if not os.path.exists(path):
         raise HTTPException(status_code=404, detail="File not found")
     try:
-        os.startfile(str(p))
-        return {"status": "launched", "target": str(p)}
+        os.startfile(path)
+        return {"status": "launched", "target": path}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to open: {e}")
 
 
+def _shell_select_in_folder(file_path: str) -> bool:
+    """
+    Open Explorer on the file's folder with the file selected, in-process via
+    shell32.SHOpenFolderAndSelectItems (no explorer.exe spawn).
+    Returns False if the shell API is unavailable or fails; caller falls back.
+    """
+    try:
+        import ctypes
+        from ctypes import wintypes
+        shell32 = ctypes.windll.shell32
+        ole32 = ctypes.windll.ole32
+    except (ImportError, AttributeError, OSError):
+        return False
+
+    shell32.SHParseDisplayName.argtypes = [
+        wintypes.LPCWSTR, ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p),
+        wintypes.ULONG, ctypes.POINTER(wintypes.ULONG),
+    ]
+    shell32.SHOpenFolderAndSelectItems.argtypes = [
+        ctypes.c_void_p, wintypes.UINT, ctypes.POINTER(ctypes.c_void_p), wintypes.DWORD,
+    ]
+    ole32.CoTaskMemFree.argtypes = [ctypes.c_void_p]
+
+    hr_init = ole32.CoInitializeEx(None, 0x2)  # COINIT_APARTMENTTHREADED
+    pidl = ctypes.c_void_p()
+    try:
+        if shell32.SHParseDisplayName(file_path, None, ctypes.byref(pidl), 0, None) != 0:
+            return False
+        # cidl=0: pidl names the single item; its parent folder opens with it selected
+        return shell32.SHOpenFolderAndSelectItems(pidl, 0, None, 0) == 0
+    finally:
+        if pidl.value:
+            ole32.CoTaskMemFree(pidl)
+        if hr_init in (0, 1):  # S_OK / S_FALSE must be balanced
+            ole32.CoUninitialize()
+
+
+def _spawn_explorer(arg: str) -> None:
+    # fire-and-forget: explorer.exe's exit code is meaningless anyway
+    subprocess.Popen(
+        ["explorer", arg],
+        creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+        close_fds=True,
+    )
+
+
 @app.post("/shell/open-folder")
 def shell_open_folder(req: ShellRequest):
     if platform.system().lower() != "windows":
         raise HTTPException(status_code=501, detail="Open supported only on Windows")
-    p = Path(req.path)
-    if not _path_allowed(p):
+    path = req.path
+    if not _path_allowed(path):
         raise HTTPException(status_code=403, detail="Path not allowed")
 
-    target = p if p.is_dir() else p.parent
-    if not target.exists():
+    is_dir = os.path.isdir(path)
+    target = path if is_dir else os.path.dirname(os.path.normpath(path))
+    if not os.path.exists(target):
         raise HTTPException(status_code=404, detail="Folder not found")
 
     try:
-        if p.is_file():
-            subprocess.run(["explorer", f"/select,{str(p)}"], check=False)
+        if not is_dir and os.path.isfile(path):
+            if not _shell_select_in_folder(path):
+                _spawn_explorer(f"/select,{path}")
         else:
-            subprocess.run(["explorer", str(target)], check=False)
-        return {"status": "launched", "target": str(target)}
+            # explorer itself, not the folder's shell association
+            _spawn_explorer(target)
+        return {"status": "launched", "target": target}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to open folder: {e}")
 
@@ -911,16 +1699,8 @@ def multi_missing_get(
     company: Optional[str] = None,
 ):
     exp_list = [e.strip() for e in (exps or "").split(",") if e.strip()]
-    out = multi_exp_missing(
-        parents_order=PARENT_ORDER,
-        roots=ALLOWED_ROOTS,
-        exp_codes=exp_list,
-        year=year,
-        month=month,
-        company=company,
-        limit=MULTI_EXP_LIMIT,
-    )
-    return JSONResponse({
+    out = _multi_missing(exp_list, year, month, company)
+    return ORJSONResponse({
         "results": out.get("items", []),
         "summary": out.get("summary", {}),
         "invalid": out.get("invalid", []),
@@ -928,52 +1708,89 @@ def multi_missing_get(
     })
 
 @app.post("/multi-missing-docx")
-def multi_missing_docx(req: MultiMissingRequest):
-    out = multi_exp_missing(
+async def multi_missing_docx(req: MultiMissingRequest):
+    # Walk + docx build are both blocking: keep them off the event loop
+    body, filename, media_type = await _offload(_build_missing_report, req)
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@lru_cache(maxsize=1)
+def _docx_template() -> bytes:
+    # Blank document with core properties set, saved once; python-docx would
+    # otherwise reopen and re-read its bundled default.docx on every report
+    from docx import Document
+    doc = Document()
+    doc.core_properties.author = DOCX_REPORT_AUTHOR
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _multi_missing(
+    exp_list: List[str],
+    year: Optional[str],
+    month: Optional[str],
+    company: Optional[str],
+) -> Dict:
+    # Same walk for the table and its .docx export: cached like the coverage views
+    key = ("multi", tuple(exp_list), year, (month or "").lower(), (company or "").lower())
+    return _coverage_cache.get_or_compute(key, lambda: multi_exp_missing(
         parents_order=PARENT_ORDER,
         roots=ALLOWED_ROOTS,
-        exp_codes=req.exps or [],
-        year=req.year,
-        month=req.month,
-        company=req.company,
+        exp_codes=exp_list,
+        year=year,
+        month=month,
+        company=company,
         limit=MULTI_EXP_LIMIT,
-    )
+    ))
+
+
+def _build_missing_report(req: MultiMissingRequest):
+    out = _multi_missing(req.exps or [], req.year, req.month, req.company)
+    items = out.get("items", [])
 
     # Try to create a .docx; fall back to .txt if python-docx is unavailable
     try:
         from docx import Document
-        doc = Document()
-        doc.core_properties.author = DOCX_REPORT_AUTHOR
+        doc = Document(io.BytesIO(_docx_template()))
         doc.add_heading('Missing Folders Report', level=1)
 
         meta = doc.add_paragraph()
         meta.add_run(f"Year: {req.year or '—'}   Month: {req.month or '—'}   Company: {req.company or '—'}")
 
-        table = doc.add_table(rows=1, cols=2)
-        hdr = table.rows[0].cells
+        # All rows up front: add_row() re-reads the grid for every row
+        table = doc.add_table(rows=len(items) + 1, cols=2)
+        rows = table.rows
+        hdr = rows[0].cells
         hdr[0].text = "EXP"
         hdr[1].text = "Missing Folders"
 
-        for item in out.get("items", []):
-            row = table.add_row().cells
-            row[0].text = item.get("exp", "")
-            row[1].text = ", ".join(item.get("missing", [])) or "—"
-
-        REPORTS_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        tmp = REPORTS_OUTPUT_DIR / f"{DOCX_REPORT_BASENAME}.docx"
-        doc.save(tmp)
-        return FileResponse(str(tmp), filename=f"{DOCX_REPORT_BASENAME}.docx")
+        for row, item in zip(rows[1:], items):
+            cells = row.cells
+            cells[0].text = item.get("exp", "")
+            cells[1].text = ", ".join(item.get("missing", [])) or "—"
+
+        buf = io.BytesIO()
+        doc.save(buf)
+        return (
+            buf.getvalue(),
+            f"{DOCX_REPORT_BASENAME}.docx",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        )
 
     except Exception:
-        tmpdir = Path(tempfile.mkdtemp())
-        txt = tmpdir / (DOCX_REPORT_BASENAME + ".txt")
-        with open(txt, "w", encoding="utf-8") as f:
-          f.write("Missing Folders Report\n")
-          f.write(f"Year: {req.year or '—'}  Month: {req.month or '—'}  Company: {req.company or '—'}\n\n")
-          for item in out.get("items", []):
-              miss = ", ".join(item.get("missing", [])) or "—"
-              f.write(f"{item.get('exp','')}: {miss}\n")
-        return FileResponse(str(txt), filename=f"{DOCX_REPORT_BASENAME}.txt")
+        lines = [
+            "Missing Folders Report\n",
+            f"Year: {req.year or '—'}  Month: {req.month or '—'}  Company: {req.company or '—'}\n\n",
+        ]
+        for item in items:
+            miss = ", ".join(item.get("missing", [])) or "—"
+            lines.append(f"{item.get('exp','')}: {miss}\n")
+        return "".join(lines).encode("utf-8"), f"{DOCX_REPORT_BASENAME}.txt", "text/plain; charset=utf-8"
 
 
 # ---- Static frontend at ROOT (/) ----
@@ -983,24 +1800,39 @@ if FRONTEND_DIR.exists():
 
 
 # ---- Helper: list files inside a folder (used by /coverage-files) ----
-def _list_files_in_folder(folder_path: Path, max_depth: int = 2, limit: int = 500):
+def _list_files_in_folder(folder_path: str, max_depth: int = 2, limit: int = 500):
     out = []
-    if not folder_path.exists() or not folder_path.is_dir():
+    if not os.path.isdir(folder_path):
         return out
 
-    base_parts = Path(folder_path).resolve().parts
-    for dirpath, _dirnames, filenames in os.walk(folder_path):
-        depth = len(Path(dirpath).resolve().parts) - len(base_parts)
-        if depth > max_depth:
+    # Same order as os.walk (files of a folder, then its subfolders), but with
+    # scandir type info and without resolve()-ing every directory for its depth.
+    stack = [(folder_path, 0)]
+    while stack:
+        dirpath, depth = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(dirpath) as it:
+                parent_name = os.path.basename(dirpath)
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if (depth < max_depth and not entry.is_symlink()
+                                and not _excluded_dir(entry.name)):
+                            subdirs.append(entry.path)
+                        continue
+                    out.append({
+                        "kind": "file",
+                        "file_name": entry.name,
+                        "parent_folder": parent_name,
+                        "full_path": entry.path,
+                    })
+                    if len(out) >= limit:
+                        return out
+        except OSError:
             continue
-        for fname in filenames:
-            full = Path(dirpath) / fname
-            out.append({
-                "kind": "file",
-                "file_name": fname,
-                "parent_folder": Path(dirpath).name,
-                "full_path": str(full),
-            })
-            if len(out) >= limit:
-                return out
+        stack.extend((d, depth + 1) for d in reversed(subdirs))
     return out
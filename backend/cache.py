@@ -0,0 +1,100 @@
+# ---------------------------
+# backend/cache.py
+# ---------------------------
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+"""
+Small in-process TTL cache (no extra dependency).
+
+- Thread-safe: FastAPI runs sync endpoints on a worker thread pool
+- Entries expire after `ttl` seconds; oldest entries are dropped past `maxsize`
+- Cached values are shared between requests, so callers must not mutate them
+- on_evict (optional) is called with every value dropped without being handed
+  out (expired, evicted, replaced), e.g. to close a resource; caches with it
+  also sweep expired entries on every access
+"""
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0,
+                 on_evict: Optional[Callable[[Any], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, or compute + store it.
+        The computation runs outside the lock so slow walks don't serialize.
+        """
+        if self.ttl <= 0:
+            return compute()
+
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+
+        value = compute()
+        self._store(key, value)
+        return value
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove and return a live entry (None if missing or expired)."""
+        with self._lock:
+            hit = self._data.pop(key, None)
+            dropped = self._sweep() if self.on_evict else []
+        if hit is not None and hit[0] <= time.monotonic():
+            dropped.append(hit[1])
+            hit = None
+        self._dispose(dropped)
+        return None if hit is None else hit[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            self._dispose([value])
+            return
+        self._store(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            dropped = [v for _, v in self._data.values()]
+            self._data.clear()
+        if self.on_evict:
+            self._dispose(dropped)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            old = self._data.get(key)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            dropped = [old[1]] if old is not None and old[1] is not value else []
+            if self.on_evict:
+                dropped += self._sweep()
+            if len(self._data) > self.maxsize:
+                dropped += self._evict()
+        if self.on_evict:
+            self._dispose(dropped)
+
+    def _sweep(self) -> List[Any]:
+        # Under the lock: remove expired entries, return their values
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in self._data.items() if exp <= now]
+        return [self._data.pop(k)[1] for k in expired]
+
+    def _evict(self) -> List[Any]:
+        # Under the lock: drop expired entries first, then the oldest inserted ones
+        dropped = self._sweep()
+        while len(self._data) > self.maxsize:
+            dropped.append(self._data.pop(next(iter(self._data)))[1])
+        return dropped
+
+    def _dispose(self, values: List[Any]) -> None:
+        # Outside the lock: on_evict may block (e.g. closing a walk)
+        if self.on_evict:
+            for v in values:
+                self.on_evict(v)
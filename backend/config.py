@@ -1,6 +1,7 @@
 # ---------------------------
 # backend/config.py
 # ---------------------------
+import os
 from pathlib import Path
 
 """
@@ -8,7 +9,8 @@ Configuration for Smart Document Finder (single-user setup).
 
 - Searches only your mapped/shared drive roots set in ALLOWED_ROOTS
 - Filename-only, case-insensitive matching is handled by the backend
-- No SQLite index by default (set USE_INDEX=True after building db.sqlite)
+- No SQLite index by default (set USE_INDEX=True or SDF_USE_INDEX=1: it is then
+  built in the background at startup, outside the source tree, see DB_PATH)
 """
 
 # Shared-folder roots to search (use *raw* strings for Windows/UNC paths)
@@ -34,13 +36,57 @@ PARENT_ORDER = [
 DEFAULT_PAGE_SIZE = 50
 MAX_PAGE_SIZE = 200
 
+# /coverage-files de-duplication
+# False → normalized path string (no extra stat per file)
+# True  → device+inode identity (collapses junctions/aliased paths, one stat per file)
+DEDUP_BY_INODE = False
+
+# Result cache for /coverage-rows and /monthly-coverage (seconds; 0 disables)
+# Override with the SDF_CACHE_TTL environment variable
+CACHE_TTL_SECONDS = float(os.environ.get("SDF_CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = 256
+
+# Folder-tree cache for /browse-children and has_children probes (seconds)
+BROWSE_CACHE_TTL_SECONDS = 5.0
+
+# How long a paused /browse-list walk waits for its "load more" request (seconds)
+BROWSE_CURSOR_TTL_SECONDS = 60.0
+
+# Worker threads for filesystem walks (async endpoints offload to these)
+WALK_THREADS = max(4, min(32, (os.cpu_count() or 1) * 4))
+
+# Concurrent folder expansions per /coverage-files request (hides SMB latency)
+EXPAND_THREADS = 8
+
+# Search scopes (roots / month folders) walked concurrently per walk_search
+SEARCH_SCOPE_THREADS = 8
+
+# Folder names (lowercase) never descended into by searches or the index:
+# tool/cache trees and Windows system folders that never hold documents
+EXCLUDE_DIRS = {
+    ".git", "node_modules", "__pycache__", ".venv", "venv", ".mypy_cache",
+    "$recycle.bin", "system volume information",
+}
+# Also skip hidden (dot-prefixed) folders: .svn, .cache, .Trash-1000, ...
+EXCLUDE_HIDDEN_DIRS = True
+
 # Search mode
 # False → direct filesystem walk (simple to start)
-# True  → use prebuilt SQLite index (faster on very large folders)
-USE_INDEX = False
+# True  → /search answers from a SQLite index built in the background at startup
+#         (walks until the first build finishes; the build crawls ALLOWED_ROOTS)
+# Override with the SDF_USE_INDEX environment variable (1/0)
+USE_INDEX = os.environ.get("SDF_USE_INDEX", "0").strip().lower() in ("1", "true", "yes", "on")
 
-# SQLite DB path (used only if USE_INDEX=True)
-DB_PATH = Path(__file__).parent / "db.sqlite"
+# SQLite DB path (used only if USE_INDEX=True), kept out of the source tree:
+# %LOCALAPPDATA%\SmartDocFinder on Windows, ~/.cache/SmartDocFinder elsewhere.
+# Override with the SDF_DB_PATH environment variable
+DB_PATH = Path(
+    os.environ.get("SDF_DB_PATH")
+    or Path(os.environ.get("LOCALAPPDATA") or Path.home() / ".cache") / "SmartDocFinder" / "db.sqlite"
+)
+
+# Rebuild the index every N seconds (0 = build once at startup)
+INDEX_REFRESH_SECONDS = 600
 
 # CORS for frontend (keep "*" if serving frontend from same backend or LAN)
 CORS_ALLOW_ORIGINS = ["*"]
@@ -51,9 +97,6 @@ CORS_ALLOW_ORIGINS = ["*"]
 # Hard cap on how many EXP codes a user can queue in one report
 MULTI_EXP_LIMIT = 30
 
-# Where to drop generated reports (the API also supports temp files)
-REPORTS_OUTPUT_DIR = Path(__file__).parent / "reports"
-
 # Default naming for generated .docx reports
 DOCX_REPORT_BASENAME = "Missing_Folders_Report"
 DOCX_REPORT_AUTHOR = "Smart Document Finder"
@@ -1,71 +1,414 @@
 import os
 import sqlite3
-from pathlib import Path
+import threading
+import time
+from functools import lru_cache
+from itertools import islice
 
-def build_index(db_path, roots):
-    conn = sqlite3.connect(db_path)
+from .search import _enumerate_effective_roots, _excluded_dir, _norm_month
+
+# Set once the first build in this process has finished (searches walk until then)
+_ready = threading.Event()
+# Set to end the refresh loop (app shutdown)
+_stop = threading.Event()
+# time.time() when the live index's build started (changes after it may be missing)
+_built_at = 0.0
+
+# Rows per executemany call (bounds memory while the walk streams in)
+_INSERT_BATCH = 10_000
+
+# A directory listing is reused when the directory's mtime is unchanged, unless
+# that mtime is this close to when it was listed (same clock tick: a change made
+# right after the listing could keep the mtime; 2 s covers FAT/SMB granularity)
+_RACY_NS = 2_000_000_000
+
+# Trigram index over name_l: needs queries of >= 3 chars and an FTS5-enabled SQLite
+_TRIGRAM_MIN = 3
+_has_names = False
+
+# One read connection per worker thread, reused across requests (hot page cache)
+_readers = threading.local()
+
+
+def build_index(db_path, roots, full=False):
+    """
+    Index every folder and file under `roots`.
+    Lowercased copies are stored so filters don't depend on SQLite's ASCII-only LOWER().
+    dir_l is the lowercased directory part used by the month filter: the
+    containing folder for files, the folder itself for folders (same as the walk).
+    Builds into a side table and swaps it in, so readers never see a partial index.
+    `names` is a contentless FTS5 trigram table keyed by the files rowid, so
+    substring queries don't scan every name.
+
+    `dirs` keeps each directory's listing with its mtime: a rebuild stats every
+    directory but only re-lists the ones whose mtime moved (entries added,
+    removed or renamed), so on a share the cost follows the churn. `full=True`
+    ignores the saved listings.
+    """
+    global _has_names, _built_at
+    started = time.time()
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    # autocommit mode: transactions below are explicit
+    conn = sqlite3.connect(db_path, isolation_level=None)
     cur = conn.cursor()
-    cur.execute("DROP TABLE IF EXISTS files")
+    # The index is disposable (rebuilt from disk if a build dies), so skip fsyncs.
+    # WAL rather than journal_mode=OFF/locking_mode=EXCLUSIVE: searches keep
+    # reading the live table while files_new is filled.
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=OFF")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-65536")
+    cur.execute("DROP TABLE IF EXISTS files_new")
+    cur.execute("DROP TABLE IF EXISTS names_new")
+    cur.execute("DROP TABLE IF EXISTS dirs_new")
     cur.execute("""
-        CREATE TABLE files (
+        CREATE TABLE dirs_new (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER,
+            listed_ns INTEGER,
+            subdirs TEXT,
+            files TEXT
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE files_new (
+            kind TEXT,
             file_name TEXT,
             parent_folder TEXT,
-            full_path TEXT
+            full_path TEXT,
+            name_l TEXT,
+            path_l TEXT,
+            dir_l TEXT
         )
     """)
 
+    has_dirs = not full and cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'dirs'"
+    ).fetchone() is not None
+    lookup = conn.cursor()
+
+    def saved(dirpath):
+        if not has_dirs:
+            return None
+        return lookup.execute(
+            "SELECT mtime_ns, listed_ns, subdirs, files FROM dirs WHERE path = ?", (dirpath,)
+        ).fetchone()
+
+    insert = "INSERT INTO files_new VALUES (?, ?, ?, ?, ?, ?, ?)"
+    dir_rows = []
+    rows = _index_rows(roots, saved, dir_rows)
+    cur.execute("BEGIN")
+    try:
+        while True:
+            batch = list(islice(rows, _INSERT_BATCH))
+            if not batch:
+                break
+            cur.executemany(insert, batch)
+            cur.executemany("INSERT OR REPLACE INTO dirs_new VALUES (?, ?, ?, ?, ?)", dir_rows)
+            dir_rows.clear()
+        cur.execute("COMMIT")
+    except BaseException:
+        cur.execute("ROLLBACK")
+        conn.close()
+        raise
+
+    try:
+        # name_l is already lowercased, so keep the tokenizer case-sensitive
+        cur.execute(
+            "CREATE VIRTUAL TABLE names_new USING fts5("
+            "name_l, content='', tokenize='trigram case_sensitive 1')"
+        )
+        cur.execute("INSERT INTO names_new (rowid, name_l) SELECT rowid, name_l FROM files_new")
+        has_names = True
+    except sqlite3.OperationalError:
+        has_names = False  # no FTS5/trigram in this SQLite build: instr() scan only
+
+    cur.execute("BEGIN")
+    cur.execute("DROP TABLE IF EXISTS files")
+    cur.execute("ALTER TABLE files_new RENAME TO files")
+    # serves search_index's ORDER BY straight from the index
+    cur.execute("CREATE INDEX files_order ON files (kind DESC, name_l, full_path)")
+    cur.execute("DROP TABLE IF EXISTS dirs")
+    cur.execute("ALTER TABLE dirs_new RENAME TO dirs")
+    cur.execute("DROP TABLE IF EXISTS names")
+    if has_names:
+        cur.execute("ALTER TABLE names_new RENAME TO names")
+    cur.execute("COMMIT")
+    conn.close()
+    _has_names = has_names
+    _built_at = started
+
 
+def _index_rows(roots, saved, dir_rows):
+    """
+    Index rows in walk order (list_under pages in rowid order).
+    Listings come from `saved(dirpath)` when still valid, else from scandir;
+    each directory's listing is appended to `dir_rows` for the next build.
+    """
     for root in roots:
-        for dirpath, _, filenames in os.walk(root):
-            for fname in filenames:
+        stack = [root]
+        while stack:
+            dirpath = stack.pop()
+            listing = _listing(dirpath, saved(dirpath))
+            if listing is None:
+                continue  # gone or unreadable: skipped, like os.walk
+            mtime_ns, listed_ns, subdirs, files = listing
+            dir_rows.append((dirpath, mtime_ns, listed_ns, "\0".join(subdirs), "\0".join(files)))
+
+            head, folder_name = os.path.split(os.path.normpath(dirpath))
+            dir_l = dirpath.lower()
+            yield ("folder", folder_name, os.path.basename(head), dirpath,
+                   folder_name.lower(), dir_l, dir_l)
+            for fname in files:
                 full_path = os.path.join(dirpath, fname)
-                parent_folder = os.path.basename(os.path.dirname(full_path))
-                cur.execute(
-                    "INSERT INTO files (file_name, parent_folder, full_path) VALUES (?, ?, ?)",
-                    (fname, parent_folder, full_path)
-                )
+                yield ("file", fname, folder_name, full_path,
+                       fname.lower(), full_path.lower(), dir_l)
+            stack.extend(os.path.join(dirpath, d) for d in reversed(subdirs))
 
-    conn.commit()
-    conn.close()
 
-def search_index(db_path, query, year=None, month=None, company=None, page=1, page_size=50):
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
+def _listing(dirpath, prev):
+    """
+    (mtime_ns, listed_ns, subdirs, files) of `dirpath` in scandir order, or None.
+    subdirs are the directories to descend into (symlinked ones are not, as in
+    os.walk, nor into _excluded_dir ones); files are all other entries. `prev` is the saved row, reused when
+    the directory's mtime hasn't moved since it was listed.
+    """
+    try:
+        mtime_ns = os.stat(dirpath).st_mtime_ns
+    except OSError:
+        return None
+    if prev is not None:
+        prev_mtime, listed_ns, subdirs, files = prev
+        if prev_mtime == mtime_ns and mtime_ns < listed_ns - _RACY_NS:
+            return (mtime_ns, listed_ns,
+                    subdirs.split("\0") if subdirs else [],
+                    files.split("\0") if files else [])
 
-    filters = ["LOWER(file_name) LIKE ?"]
-    params = [f"%{query.lower()}%"]
+    listed_ns = time.time_ns()
+    subdirs, files = [], []
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                elif not entry.is_symlink() and not _excluded_dir(entry.name):
+                    subdirs.append(entry.name)
+    except OSError:
+        return None
+    return mtime_ns, listed_ns, subdirs, files
 
-    if year:
-        filters.append("LOWER(file_name) LIKE ?")
-        params.append(f"%{year.lower()}%")
-    if month:
-        filters.append("LOWER(file_name) LIKE ?")
-        params.append(f"%{month.lower()}%")
-    if company:
-        filters.append("LOWER(file_name) LIKE ?")
-        params.append(f"%{company.lower()}%")
 
-    where_clause = " AND ".join(filters)
-    count_sql = f"SELECT COUNT(*) FROM files WHERE {where_clause}"
-    total = cur.execute(count_sql, params).fetchone()[0]
+def _reader(db_path):
+    """
+    This thread's read-only connection to `db_path`. The database is in WAL mode,
+    so reads never wait on a rebuild; SQLite re-prepares after the table swap.
+    """
+    conns = getattr(_readers, "conns", None)
+    if conns is None:
+        conns = _readers.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA cache_size=-32768")  # 32 MB per worker thread
+        conns[db_path] = conn
+    return conn
 
-    offset = (page - 1) * page_size
-    sql = f"""
-        SELECT file_name, parent_folder, full_path
-        FROM files
-        WHERE {where_clause}
-        ORDER BY file_name ASC
-        LIMIT ? OFFSET ?
+
+def index_ready() -> bool:
+    return _ready.is_set()
+
+
+def index_built_at() -> float:
+    return _built_at
+
+
+def start_index_refresher(db_path, roots, interval: float):
+    """
+    Build the index in a daemon thread now, then rebuild every `interval` seconds
+    (no watcher dependency; archive shares don't deliver change events reliably)
+    until stop_index_refresher().
     """
+    _stop.clear()
+
+    def loop():
+        while not _stop.is_set():
+            try:
+                build_index(db_path, roots)
+                _ready.set()
+            except Exception:
+                pass  # keep serving the last good index (or walking)
+            if interval <= 0 or _stop.wait(interval):
+                return
+
+    t = threading.Thread(target=loop, name="index-refresh", daemon=True)
+    t.start()
+    return t
+
+
+def stop_index_refresher():
+    """End the refresh loop; a build already running finishes first (daemon thread)."""
+    _stop.set()
+
+
+def list_under(db_path, base, q=None, offset=0, limit=1000):
+    """
+    Paths of every indexed folder/file below `base` (not `base` itself) whose
+    name contains `q`, in walk order. Case-insensitive prefix match on the path.
+    """
+    prefix = base.rstrip("\\/").lower() + os.sep
+    sql = "SELECT full_path FROM files WHERE substr(path_l, 1, ?) = ?"
+    params = [len(prefix), prefix]
+    if q:
+        sql += " AND instr(name_l, ?) > 0"
+        params.append(q.lower())
+    sql += " ORDER BY rowid LIMIT ? OFFSET ?"
+    params += [limit, offset]
+
+    return [r[0] for r in _reader(db_path).execute(sql, params)]
+
+
+def search_index(db_path, query, roots, year=None, month=None, company=None, page=1, page_size=50,
+                 after=None, parent_filter=None):
+    """
+    Same results as search.walk_search, answered from the index:
+    scope from _enumerate_effective_roots, then the walk's filename/company/year/month
+    rules and parent_filter's whole-segment match on the directory.
+    `after` is the previous page's next_cursor: the page then starts right after that
+    row via an index seek instead of reading and discarding OFFSET rows.
+    """
+    month = _norm_month(month)
+    q = (query or "").strip().lower()
+
+    scopes = _enumerate_effective_roots(roots, year, month)
+    if not scopes:
+        return {"count": 0, "page": page, "page_size": page_size, "total_pages": 1, "items": [],
+                "next_cursor": None}
+
+    # params in the order _search_sql() places the placeholders
+    params = []
+    for s in scopes:
+        prefix = s.rstrip("\\/") + os.sep
+        params += [s, len(prefix), prefix]
+    params.append(q)
+    trigram = _has_names and len(q) >= _TRIGRAM_MIN
+    if trigram:
+        params.append('"' + q.replace('"', '""') + '"')
+    if company:
+        params.append(company.lower())
+    year_only = bool(year) and not month
+    if year_only:
+        params.append(str(year).lower())
+    if month:
+        params.append(month)
+    parent_l = (parent_filter or "").strip().lower()
+    if parent_l:
+        params += ["/" + parent_l + "/", parent_l]
+
+    page_sql, keyset_sql, count_sql = _search_sql(
+        len(scopes), bool(q), trigram, bool(company), year_only, bool(month), bool(parent_l)
+    )
+    cur = _reader(db_path).cursor()
+    key = _parse_cursor(after)
+    if key is None:
+        offset = (page - 1) * page_size
+        rows = cur.execute(page_sql, params + [page_size, offset]).fetchall()
+        if rows:
+            total = rows[0][5]
+        elif offset:
+            # past the last page: no row to carry the total
+            total = cur.execute(count_sql, params).fetchone()[0]
+        else:
+            total = 0
+    else:
+        kind, name_l, full_path = key
+        rows = cur.execute(keyset_sql, params + [kind, kind, name_l, full_path, page_size]).fetchall()
+        total = cur.execute(count_sql, params).fetchone()[0]
     items = [
-        {"file_name": r[0], "parent_folder": r[1], "full_path": r[2]}
-        for r in cur.execute(sql, params + [page_size, offset]).fetchall()
+        {"kind": r[0], "file_name": r[1], "parent_folder": r[2], "full_path": r[3]}
+        for r in rows
     ]
+    next_cursor = None
+    if len(rows) == page_size:
+        last = rows[-1]
+        next_cursor = f"{last[0]}:{len(last[4])}:{last[4]}{last[3]}"
 
-    conn.close()
     return {
         "count": total,
         "page": page,
+        "page_size": page_size,
         "total_pages": max(1, -(-total // page_size)),
-        "items": items
+        "items": items,
+        "next_cursor": next_cursor,
     }
+
+
+@lru_cache(maxsize=256)
+def _search_sql(n_scopes, has_q, trigram, company, year_only, month, parent):
+    """
+    (page, keyset page, count) SQL for one filter shape. The text only depends
+    on which filters are set, so it is built once per shape and every call with
+    that shape hits the connection's prepared-statement cache.
+    """
+    filters = ["(" + " OR ".join(["full_path = ? OR substr(full_path, 1, ?) = ?"] * n_scopes) + ")"]
+
+    # folders only match a non-empty query; files must also pass company/year
+    filters.append("instr(name_l, ?) > 0")
+    if not has_q:
+        filters.append("kind = 'file'")
+    if trigram:
+        # candidate rows from the trigram index; instr() above keeps the match exact
+        filters.append("rowid IN (SELECT rowid FROM names WHERE names MATCH ?)")
+    file_only = ["instr(path_l, ?) > 0"] * (company + year_only)
+    if file_only:
+        filters.append("(kind = 'folder' OR (" + " AND ".join(file_only) + "))")
+    if month:
+        filters.append("instr(dir_l, ?) > 0")
+    if parent:
+        # '/'-wrapped directory with either separator, searched for '/parent/';
+        # a file named exactly like the parent also counts
+        filters.append(
+            "(instr('/' || replace(dir_l, '\\', '/') || '/', ?) > 0"
+            " OR (kind = 'file' AND name_l = ?))"
+        )
+    where_clause = " AND ".join(filters)
+
+    # folders first ('folder' > 'file'), then name; full_path breaks ties like the
+    # walk's sort key and, unlike rowid, survives rebuilds (cursors stay valid).
+    # The window COUNT rides the same scan as the page.
+    page_sql = f"""
+        SELECT kind, file_name, parent_folder, full_path, name_l, COUNT(*) OVER ()
+        FROM files
+        WHERE {where_clause}
+        ORDER BY kind DESC, name_l, full_path
+        LIMIT ? OFFSET ?
+    """
+    keyset_sql = f"""
+        SELECT kind, file_name, parent_folder, full_path, name_l
+        FROM files
+        WHERE {where_clause}
+          AND (kind < ? OR (kind = ? AND (name_l, full_path) > (?, ?)))
+        ORDER BY kind DESC, name_l, full_path
+        LIMIT ?
+    """
+    count_sql = f"SELECT COUNT(*) FROM files WHERE {where_clause}"
+    return page_sql, keyset_sql, count_sql
+
+
+def _parse_cursor(after):
+    """
+    'kind:len(name_l):name_l full_path' (no separator: the length splits them)
+    -> (kind, name_l, full_path); None when absent or malformed.
+    """
+    if not after:
+        return None
+    kind, _, rest = after.partition(":")
+    n, _, key = rest.partition(":")
+    if kind not in ("file", "folder") or not n.isdigit() or int(n) >= len(key):
+        return None
+    n = int(n)
+    return kind, key[:n], key[n:]
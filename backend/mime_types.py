@@ -2,6 +2,7 @@
 # backend/mime_types.py
 # ---------------------------
 import mimetypes
+import os
 
 # Extra/normalized mappings to improve preview behavior
 EXTRA_TYPES = {
@@ -27,6 +28,19 @@ EXTRA_TYPES = {
     ".tiff": "image/tiff",
 }
 
+# One table for every known extension, built at import: Python's map (resolved
+# exactly as mimetypes.guess_type would, incl. suffix aliases like .tgz) under ours.
+# init() first: it loads the system mime.types and rebinds types_map.
+mimetypes.init()
+_EXT_TYPES = {
+    ext: mt
+    for ext in {*mimetypes.types_map, *mimetypes.suffix_map}
+    for mt in [mimetypes.guess_type("x" + ext)[0]]
+    if mt
+}
+_EXT_TYPES.update(EXTRA_TYPES)
+
+
 def guess_type(path: str) -> str:
     """
     Return a best-effort MIME type for the given file path.
@@ -36,15 +50,14 @@ def guess_type(path: str) -> str:
     if not path:
         return "application/octet-stream"
 
-    ext = ""
-    dot = path.rfind(".")
-    if dot != -1:
-        ext = path[dot:].lower()
-
-    # Prefer our explicit map first
-    if ext in EXTRA_TYPES:
-        return EXTRA_TYPES[ext]
-
-    # Fallback to Python's mimetypes
-    mt, _ = mimetypes.guess_type(path)
-    return mt or "application/octet-stream"
+    root, ext = os.path.splitext(path)
+    if ext in mimetypes.encodings_map or ext.lower() in mimetypes.encodings_map:
+        # report.pdf.gz: the type is the inner file's (the suffix is only its
+        # encoding), as mimetypes.guess_type has it
+        path = root
+        ext = os.path.splitext(root)[1]
+    if not ext:
+        # No extension: let mimetypes inspect the whole name
+        mt, _ = mimetypes.guess_type(path)
+        return mt or "application/octet-stream"
+    return _EXT_TYPES.get(ext.lower(), "application/octet-stream")
@@ -0,0 +1,188 @@
+# ---------------------------
+# backend/responses.py
+# ---------------------------
+import os
+import stat
+from typing import Dict, Optional, Tuple
+
+import anyio
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+"""
+Custom response classes.
+
+- ZeroCopyFileResponse: hands the open file descriptor to the ASGI server via
+  the "http.response.zerocopysend" extension so the kernel copies file -> socket
+  (sendfile) without passing the bytes through Python. Servers without the
+  extension get the regular Starlette streaming path with bigger chunks.
+  Optionally serves a single byte range (206 Partial Content).
+- conditional_file_response: ETag / If-None-Match (304) and Range handling
+  on top of ZeroCopyFileResponse, from a single stat().
+"""
+
+# Bigger read chunks for the fallback path (Starlette default is 64 KB)
+_FALLBACK_CHUNK_SIZE = 1024 * 1024
+
+
+class ZeroCopyFileResponse(FileResponse):
+    chunk_size = _FALLBACK_CHUNK_SIZE
+
+    def __init__(self, *args, byte_range: Optional[Tuple[int, int]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.byte_range = byte_range
+        if byte_range is not None and self.stat_result is not None:
+            start, end = byte_range
+            self.status_code = 206
+            self.headers["content-length"] = str(end - start + 1)
+            self.headers["content-range"] = f"bytes {start}-{end}/{self.stat_result.st_size}"
+
+    async def __call__(self, scope, receive, send) -> None:
+        extensions = scope.get("extensions") or {}
+        zerocopy = "http.response.zerocopysend" in extensions
+        # HEAD: headers only, as Starlette's FileResponse decides it
+        send_header_only = scope["method"].upper() == "HEAD"
+        if send_header_only or (not zerocopy and self.byte_range is None):
+            await super().__call__(scope, receive, send)
+            return
+
+        if self.stat_result is None:
+            try:
+                stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+            self.set_stat_headers(stat_result)
+        else:
+            stat_result = self.stat_result
+
+        if self.byte_range is not None:
+            offset, last = self.byte_range
+            count = last - offset + 1
+        else:
+            offset, count = 0, stat_result.st_size
+
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if zerocopy:
+            # open/close can block on a network share: keep them off the event loop
+            f = await anyio.to_thread.run_sync(open, self.path, "rb")
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": offset,
+                    "count": count,
+                    "more_body": False,
+                })
+            finally:
+                await anyio.to_thread.run_sync(f.close)
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as f:
+                await f.seek(offset)
+                remaining = count
+                while remaining > 0:
+                    chunk = await f.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        if self.background is not None:
+            await self.background()
+
+
+def _etag(st: os.stat_result) -> str:
+    # mtime_ns so sub-second rewrites (scanner re-saving a PDF) still change the tag
+    return f'"{st.st_ino:x}-{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" range (inclusive end).
+    Returns None when absent/malformed/multi-range, when the range is invalid
+    (last byte before first, ignored per RFC 9110 14.1.1) or the file is empty:
+    the caller serves the full file. Raises ValueError when a valid range
+    cannot be satisfied (first byte at or past the end, zero-length suffix).
+    """
+    if not header or not header.startswith("bytes=") or "," in header or size == 0:
+        return None
+    start_s, sep, end_s = header[6:].strip().partition("-")
+    if not sep:
+        return None
+    try:
+        first = int(start_s) if start_s else None
+        last = int(end_s) if end_s else None
+    except ValueError:
+        return None
+
+    if first is None:
+        # suffix range: last N bytes
+        if last is None or last < 0:
+            return None
+        if last == 0:
+            raise ValueError("unsatisfiable range")
+        return max(0, size - last), size - 1
+    if first < 0 or (last is not None and last < first):
+        return None
+    if first >= size:
+        raise ValueError("unsatisfiable range")
+    return first, size - 1 if last is None else min(last, size - 1)
+
+
+def conditional_file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    headers: Dict[str, str],
+    st: Optional[os.stat_result] = None,
+) -> Response:
+    """
+    Serve `path` with ETag/Last-Modified, answering If-None-Match with 304
+    and a single Range with 206. Stats the file once (or reuses the caller's `st`).
+    """
+    if st is None:
+        try:
+            st = os.stat(path)
+        except PermissionError:
+            raise HTTPException(status_code=403, detail="Permission denied")
+        except OSError:
+            raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(st.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    etag = _etag(st)
+    headers = {**headers, "ETag": etag, "Accept-Ranges": "bytes"}
+
+    inm = request.headers.get("if-none-match")
+    if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == etag:
+        try:
+            byte_range = _parse_range(request.headers.get("range"), st.st_size)
+        except ValueError:
+            raise HTTPException(
+                status_code=416,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{st.st_size}"},
+            )
+
+    resp = ZeroCopyFileResponse(
+        path,
+        media_type=media_type,
+        headers=headers,
+        stat_result=st,
+        byte_range=byte_range,
+    )
+    # FileResponse derives its own etag from stat; keep ours consistent with If-None-Match
+    resp.headers["etag"] = etag
+    return resp
@@ -1,10 +1,16 @@
 # ---------------------------
 # backend/search.py
 # ---------------------------
+import heapq
 import os
 import re
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .config import EXCLUDE_DIRS, EXCLUDE_HIDDEN_DIRS, SEARCH_SCOPE_THREADS
+
+T = TypeVar("T")
 
 # We only treat full month names (no numeric mapping/abbrs)
 _FULL_MONTHS = {
@@ -44,75 +50,188 @@ def _norm_exp_code(s: str) -> Optional[str]:
     return f"EXP-{m.group(1)}".upper()
 
 
-# ---------- MONTH HELPERS (text 'contains' only) ----------
+# ---------- PATH HELPERS (plain str; no Path objects in the walk loops) ----------
 
-def _dir_contains_month(dir_parts: List[str], month: Optional[str]) -> bool:
-    """
-    True if ANY directory segment contains the month text (case-insensitive).
-    """
-    if not month:
-        return True
-    m = month.strip().lower()
-    for seg in dir_parts:
-        if m in (seg or "").lower():
-            return True
-    return False
+_SEP_RX = re.compile(r"[\\/]+")
+
+def _path_segments(path_str: str) -> List[str]:
+    """Path segments split on either separator (anchor becomes e.g. 'C:' or '')."""
+    return _SEP_RX.split(path_str)
+
+_SEPS = (os.sep, os.altsep) if os.altsep else (os.sep,)
 
-def _month_ok_for_file(full_path: str, month: Optional[str], year: Optional[str]) -> bool:
+def _is_unc_server(head: str) -> bool:
+    """'\\\\server' (no share yet): '<head>\\share' is a UNC drive with no name."""
+    return head[:1] in _SEPS and head[1:2] in _SEPS and not any(c in head[2:] for c in _SEPS)
+
+def _dir_names(dirpath: str) -> Tuple[str, str]:
     """
-    For FILE rows:
-      - If month selected, at least one DIRECTORY segment must CONTAIN the month text.
+    (name, parent name) of a directory, i.e. Path.name / Path.parent.name.
+    Walked paths are '<dir><sep><name>', so a slice answers; normpath only
+    when the last two segments could change under it (dot segments, doubled
+    or alternate separators).
     """
-    if not month:
-        return True
-    p = Path(full_path)
-    return _dir_contains_month([seg for seg in p.parts[:-1]], month)
+    head, sep, name = dirpath.rpartition(os.sep)
+    if sep and name not in ("", ".", "..") and not head.endswith(_SEPS) and not (
+        os.altsep and os.altsep in name
+    ) and not _is_unc_server(head):
+        parent = os.path.basename(head)
+        if parent not in (".", ".."):
+            return name, parent
+    head, name = os.path.split(os.path.normpath(dirpath))
+    return name, os.path.basename(head)
+
+
+def _excluded_dir(name: str) -> bool:
+    """Folders never descended into: EXCLUDE_DIRS and, if enabled, hidden dot-folders."""
+    return (EXCLUDE_HIDDEN_DIRS and name.startswith(".")) or name.lower() in EXCLUDE_DIRS
 
-def _month_ok_for_folder(full_path: str, month: Optional[str], year: Optional[str]) -> bool:
+
+def _scan_tree(root: str) -> Iterator[Tuple[str, List[str], List[os.DirEntry]]]:
     """
-    For FOLDER rows:
-      - If month selected, at least one DIRECTORY segment must CONTAIN the month text.
+    os.walk(root) order, built on one scandir pass per directory:
+    yields (dirpath, dirnames, file_entries). File entries carry their joined
+    .path, so loops don't os.path.join every name. Like os.walk: unreadable
+    directories are skipped, symlinked directories are listed but not descended
+    into, and removing names from dirnames prunes them. Excluded folders
+    (_excluded_dir) are left out entirely.
     """
-    if not month:
-        return True
-    return _dir_contains_month(list(Path(full_path).parts), month)
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        dirnames: List[str] = []
+        files: List[os.DirEntry] = []
+        links = set()
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if _excluded_dir(entry.name):
+                            continue
+                        dirnames.append(entry.name)
+                        if entry.is_symlink():
+                            links.add(entry.name)
+                    else:
+                        files.append(entry)
+        except OSError:
+            continue
+        yield dirpath, dirnames, files
+        stack.extend(os.path.join(dirpath, d) for d in reversed(dirnames) if d not in links)
 
 
 # ---------- FILTER CHECKS ----------
 
-def _passes_filters_file(
-    file_name: str,
-    full_path: str,
+def _file_filter(
     query: str,
     company: Optional[str],
     year: Optional[str],
     month: Optional[str],
-) -> bool:
+) -> Callable[[str, str], bool]:
     """
-    Files:
+    Build the per-file check once per search: ok(file_name, full_path).
       - query: filename-only, case-insensitive, substring
       - company/year: anywhere in full path (string match)
-      - month: some directory segment must CONTAIN the month text
+      - month: not re-checked per file. Every caller walks the scopes from
+        _enumerate_effective_roots, which with a month are month-named
+        folders, so each file below already has a segment containing it.
+        It still decides whether year filters the path.
+    Terms are lowercased here. Which company/year terms the directory path
+    already contains is remembered for the last directory (a directory's files
+    arrive together); the full path is only lowercased for a term the
+    directory doesn't satisfy.
     """
-    name_l = (file_name or "").lower()
-    path_l = (full_path or "").lower()
+    q_l = (query or "").lower()
+    path_terms = []
+    if company:
+        path_terms.append(company.lower())
+    # Enforce year substring only when no month filter is applied
+    if year and not month:
+        path_terms.append(str(year).lower())
+
+    # Specialized to the active filters: the common cases skip the path logic
+    if not path_terms:
+        if not q_l:
+            return lambda file_name, full_path: True
+
+        def name_ok(file_name: str, full_path: str) -> bool:
+            return q_l in file_name.lower()
+        return name_ok
+
+    def ok(file_name: str, full_path: str) -> bool:
+        if q_l and q_l not in file_name.lower():
+            return False
+        d = full_path.rpartition(os.sep)[0]
+        if d != last_dir[0]:
+            d_l = d.lower()
+            last_dir[:] = [d, [t for t in path_terms if t not in d_l]]
+        rest = last_dir[1]
+        if rest:
+            path_l = full_path.lower()
+            for t in rest:
+                if t not in path_l:
+                    return False
+        return True
 
-    if query and query.lower() not in name_l:
-        return False
-    if company and company.lower() not in path_l:
-        return False
+    last_dir = [None, path_terms]
+    return ok
+
+
+def _segment_matcher(name_l: str):
+    """
+    Compiled search() that finds `name_l` as a whole path segment
+    (case-insensitive, either separator).
+    """
+    return re.compile(r"(?:^|[\\/])" + re.escape(name_l) + r"(?:[\\/]|$)", re.IGNORECASE).search
 
-    # Enforce year substring only when no month filter is applied
-    if year and not month and str(year).lower() not in path_l:
-        return False
 
-    if not _month_ok_for_file(full_path, month, year):
-        return False
-    return True
+# ---------- SORT KEYS ----------
+# list.sort(key=...) computes each key once per item (decorate-sort-undecorate);
+# shared module-level functions avoid rebuilding a lambda on every call.
+
+def _item_sort_key(r: Dict) -> Tuple[bool, str]:
+    """Folders first, then case-insensitive file name."""
+    return (r.get("kind") != "folder", r["file_name"].lower())
+
+def _name_sort_key(r: Dict) -> str:
+    return r["file_name"].lower()
+
+# walk_search keeps matches as tuples until they make the page
+_ROW_FIELDS = ("kind", "file_name", "parent_folder", "full_path")
+
+def _row_sort_key(r: Tuple[str, str, str, str]) -> Tuple[bool, str, str]:
+    """
+    _item_sort_key for a (kind, file_name, parent_folder, full_path) row; ties
+    go by full_path, as in the index, so both give the same order and pages.
+    """
+    return (r[0] != "folder", r[1].lower(), r[3])
 
 
 # ---------- ROOT ENUMERATION (scope traversal) ----------
 
+def _month_dirs(parent: str, m: str) -> List[str]:
+    """
+    Subfolders of `parent` whose name contains `m` (lowercased), from a single
+    scandir pass: d_type answers is_dir(), no stat per sibling.
+    """
+    out = []
+    try:
+        with os.scandir(parent) as it:
+            for entry in it:
+                if m in entry.name.lower():
+                    try:
+                        if entry.is_dir():
+                            out.append(entry.path)
+                    except OSError:
+                        continue
+    except OSError:
+        pass
+    return out
+
+
 def _enumerate_effective_roots(roots: List[str], year: Optional[str], month: Optional[str]) -> List[str]:
     """
     STRICT hierarchy traversal (month logic = 'contains' only):
@@ -120,6 +239,8 @@ def _enumerate_effective_roots(roots: List[str], year: Optional[str], month: Opt
       - If year only: search <root>/<year>.
       - If month only: search <root>/<*> where folder name CONTAINS month text.
       - If year + month: search only month folders under <root>/<year> where folder name CONTAINS month text.
+    With a month, every folder and file below a returned scope has a segment
+    containing the month, so the walks don't re-check it per row.
     """
     effective: List[str] = []
 
@@ -136,31 +257,14 @@ def _enumerate_effective_roots(roots: List[str], year: Optional[str], month: Opt
     if month and not year:
         m = month.strip().lower()
         for r in roots:
-            if not os.path.isdir(r):
-                continue
-            try:
-                for name in os.listdir(r):
-                    full = os.path.join(r, name)
-                    if os.path.isdir(full) and (m in name.lower()):
-                        effective.append(full)
-            except PermissionError:
-                continue
+            effective += _month_dirs(r, m)
         return effective
 
     if month and year:
         m = month.strip().lower()
         y = str(year)
         for r in roots:
-            ydir = os.path.join(r, y)
-            if not os.path.isdir(ydir):
-                continue
-            try:
-                for name in os.listdir(ydir):
-                    full = os.path.join(ydir, name)
-                    if os.path.isdir(full) and (m in name.lower()):
-                        effective.append(full)
-            except PermissionError:
-                continue
+            effective += _month_dirs(os.path.join(r, y), m)
         return effective
 
     return effective
@@ -176,13 +280,25 @@ def walk_search(
     company: Optional[str],
     page: int,
     page_size: int,
+    parent_filter: Optional[str] = None,
+    exact_count: bool = True,
 ) -> Dict:
     """
     Walk filesystem and return paginated file/folder matches (baseline list).
+
+    parent_filter: if given, only keep matches that sit under (or are) a path
+    segment with that name (case-insensitive). Checked once per directory, so
+    files outside the parent are skipped before any per-file filter work.
+
+    "count" is a running total of every match (a plain counter next to the
+    bounded heap), not the length of a materialized list: only the first
+    page*page_size rows are ever kept.
+
+    exact_count=False: each scope stops walking after 4x the page window of
+    matches. The page is then sorted from those matches only and "count" may
+    be a lower bound ("count_is_lower_bound": True).
     """
     month = _norm_month(month)
-
-    matches: List[Dict] = []
     q = (query or "").strip()
 
     roots_to_walk = _enumerate_effective_roots(roots, year, month)
@@ -193,42 +309,26 @@ def walk_search(
             "page_size": page_size,
             "total_pages": 1,
             "items": [],
+            "count_is_lower_bound": False,
         }
 
-    for root in roots_to_walk:
-        if not os.path.exists(root):
-            continue
-
-        for dirpath, dirnames, filenames in os.walk(root):
-            # folders: include when folder name matches query (useful for “EXP-xxx” folders)
-            folder_name = Path(dirpath).name
-            if q and q.lower() in (folder_name.lower()):
-                if _month_ok_for_folder(dirpath, month, year):
-                    matches.append({
-                        "kind": "folder",
-                        "file_name": folder_name,
-                        "parent_folder": Path(dirpath).parent.name,
-                        "full_path": dirpath,
-                    })
+    # Sort: folders first, then files by name. Only the first `end` rows are
+    # ever returned, so each scope keeps just its own first `end` (bounded heap,
+    # memory O(end) not O(matches)) and the page is picked from their union.
+    # nsmallest is equivalent to sorted(...)[:end] (no ties: full_path decides).
+    start = max(0, (page - 1) * page_size)
+    end = start + page_size
+    # headroom past the window so the sort still sees more than the page
+    cap = None if exact_count else end * 4
 
-            # files
-            for fname in filenames:
-                full = os.path.join(dirpath, fname)
-                if _passes_filters_file(fname, full, q, company, year, month):
-                    matches.append({
-                        "kind": "file",
-                        "file_name": fname,
-                        "parent_folder": Path(dirpath).name,
-                        "full_path": full,
-                    })
+    def top(scope: str) -> Tuple[int, List[Dict]]:
+        return _top_matches([scope], q, year, month, company, parent_filter, end, cap)
 
-    # Sort: folders first, then files by name
-    matches.sort(key=lambda r: (r.get("kind") != "folder", r["file_name"].lower()))
+    parts = _map_scopes(top, roots_to_walk)
 
-    total = len(matches)
-    start = max(0, (page - 1) * page_size)
-    end = min(total, start + page_size)
-    items = matches[start:end]
+    total = sum(n for n, _ in parts)
+    top_rows = heapq.nsmallest(end, chain.from_iterable(t for _, t in parts), key=_row_sort_key)
+    items = [dict(zip(_ROW_FIELDS, r)) for r in top_rows[start:end]]
 
     return {
         "count": total,
@@ -236,9 +336,108 @@ def walk_search(
         "page_size": page_size,
         "total_pages": max(1, (total + page_size - 1) // page_size),
         "items": items,
+        "count_is_lower_bound": cap is not None and any(n >= cap for n, _ in parts),
     }
 
 
+def iter_search_hits(
+    query: str,
+    roots: List[str],
+    year: Optional[str],
+    month: Optional[str],
+    company: Optional[str],
+    parent_filter: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    walk_search's matches as result dicts, yielded as the walk finds them
+    (walk order: unsorted, uncounted). For streaming endpoints, which can send
+    the first rows before the walk has finished.
+    """
+    month = _norm_month(month)
+    q = (query or "").strip()
+    rows = _iter_matches(_enumerate_effective_roots(roots, year, month), q, year, month, company, parent_filter)
+    return (dict(zip(_ROW_FIELDS, r)) for r in rows)
+
+
+def _map_scopes(fn: Callable[[str], T], scopes: List[str]) -> List[T]:
+    """
+    [fn(scope) for scope in scopes]. Scopes are independent subtrees (often
+    separate month folders or shares): several are walked concurrently, the
+    GIL is released while listing directories. Results stay in scope order.
+    """
+    if len(scopes) > 1:
+        with ThreadPoolExecutor(max_workers=min(SEARCH_SCOPE_THREADS, len(scopes))) as ex:
+            return list(ex.map(fn, scopes))
+    return [fn(scope) for scope in scopes]
+
+
+def _top_matches(
+    roots_to_walk: List[str],
+    q: str,
+    year: Optional[str],
+    month: Optional[str],
+    company: Optional[str],
+    parent_filter: Optional[str],
+    n: int,
+    limit: Optional[int] = None,
+) -> Tuple[int, List[Tuple[str, str, str, str]]]:
+    """
+    (match count, first `n` match rows in sort order) for the given scopes.
+    With `limit`, the walk stops after that many matches (count <= limit).
+    """
+    total = 0
+
+    def counted():
+        nonlocal total
+        matches = _iter_matches(roots_to_walk, q, year, month, company, parent_filter)
+        for m in islice(matches, limit):
+            total += 1
+            yield m
+
+    items = heapq.nsmallest(n, counted(), key=_row_sort_key)
+    return total, items
+
+
+def _iter_matches(
+    roots_to_walk: List[str],
+    q: str,
+    year: Optional[str],
+    month: Optional[str],
+    company: Optional[str],
+    parent_filter: Optional[str],
+) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    walk_search's matches in walk order, as (kind, file_name, parent_folder,
+    full_path) rows: only the rows that make the page become dicts.
+    """
+    q_l = q.lower()
+    file_ok = _file_filter(q, company, year, month)
+
+    parent_l = (parent_filter or "").strip().lower()
+    in_parent = _segment_matcher(parent_l) if parent_l else None
+
+    for root in roots_to_walk:
+        if not os.path.exists(root):
+            continue
+
+        for dirpath, dirnames, files in _scan_tree(root):
+            dir_ok = in_parent is None or in_parent(dirpath) is not None
+
+            # folders: include when folder name matches query (useful for “EXP-xxx” folders)
+            folder_name, folder_parent = _dir_names(dirpath)
+            if dir_ok and q_l and q_l in folder_name.lower():
+                yield ("folder", folder_name, folder_parent, dirpath)
+
+            # files
+            for entry in files:
+                fname = entry.name
+                if not dir_ok and fname.lower() != parent_l:
+                    continue
+                full = entry.path
+                if file_ok(fname, full):
+                    yield ("file", fname, folder_name, full)
+
+
 # ---------- COVERAGE (7 parent rows for single-table UI) ----------
 
 def _find_parent_in_path(path_str: str, parent_names_lower: Dict[str, str]) -> Optional[str]:
@@ -246,13 +445,33 @@ def _find_parent_in_path(path_str: str, parent_names_lower: Dict[str, str]) -> O
     Return the canonical parent name if one of the path segments exactly matches it (case-insensitive).
     parent_names_lower: map lower_name -> canonical_name
     """
-    for seg in Path(path_str).parts:
+    for seg in _path_segments(path_str):
         canon = parent_names_lower.get(seg.lower())
         if canon:
             return canon
     return None
 
 
+def _parent_resolver(parent_names_lower: Dict[str, str]) -> Callable[[str], Optional[str]]:
+    """
+    _find_parent_in_path for the directories of a walk, memoized by dirpath:
+    a child directory only adds its own name to its parent's segments, so its
+    answer is the parent's answer or that name (no re-split of the whole path).
+    """
+    known: Dict[str, Optional[str]] = {}
+
+    def resolve(dirpath: str) -> Optional[str]:
+        head, sep, name = dirpath.rpartition(os.sep)
+        if sep and head in known:
+            canon = known[head] or parent_names_lower.get(name.lower())
+        else:
+            canon = _find_parent_in_path(dirpath, parent_names_lower)
+        known[dirpath] = canon
+        return canon
+
+    return resolve
+
+
 def coverage_rows(
     parents_order: List[str],
     roots: List[str],
@@ -278,6 +497,9 @@ def coverage_rows(
     """
     month = _norm_month(month)
     q = (query or "").strip()
+    q_l, company_l = q.lower(), (company or "").lower()
+    # year only filters the path when no month is set
+    year_l = str(year).lower() if year and not month else ""
 
     # Prepare result skeleton in requested order
     rows: Dict[str, Dict] = {}
@@ -297,64 +519,84 @@ def coverage_rows(
     if not roots_to_walk:
         return {"rows": list(rows.values())}
 
-    # Walk and compute presence + matches
-    for root in roots_to_walk:
+    # Walk and compute presence + matches, one partial result per scope
+    def scan(root: str) -> Dict[str, Dict]:
+        part = {p: {"present": False, "count": 0, "items": []} for p in parents_order}
         if not os.path.exists(root):
-            continue
+            return part
+        # per scope: the filter and resolver keep per-directory state, so
+        # concurrent scopes must not share them
+        file_ok = _file_filter(q, company, year, month)
+        parent_of = _parent_resolver(parent_names_lower)
 
-        for dirpath, dirnames, filenames in os.walk(root):
+        for dirpath, dirnames, files in _scan_tree(root):
             # mark "present" if a directory with parent name exists at this node
             for d in dirnames:
                 canon = parent_names_lower.get(d.lower())
                 if canon:
-                    rows[canon]["present"] = True
+                    part[canon]["present"] = True
 
             # check if this directory itself is a known parent (for presence)
-            canon_self = parent_names_lower.get(Path(dirpath).name.lower())
+            folder_name, folder_parent = _dir_names(dirpath)
+            canon_self = parent_names_lower.get(folder_name.lower())
             if canon_self:
-                rows[canon_self]["present"] = True
+                part[canon_self]["present"] = True
+
+            # Resolved once per directory: every file below inherits it (a file
+            # name only counts when no directory segment names a parent)
+            dir_parent = parent_of(dirpath)
 
             # folder-name match contributes to 'found' if folder is under a known parent
-            if q:
-                folder_name = Path(dirpath).name
-                if q.lower() in folder_name.lower():
+            if q_l:
+                if q_l in folder_name.lower():
                     # attribute this match to the parent found in the path (if any)
-                    parent_for_dir = _find_parent_in_path(dirpath, parent_names_lower)
+                    parent_for_dir = dir_parent
                     if parent_for_dir:
-                        if _month_ok_for_folder(dirpath, month, year):
-                            # company/year checks happen on full path string
-                            pl = dirpath.lower()
-                            if (not company or company.lower() in pl) and (not year or month or str(year).lower() in pl):
-                                rows[parent_for_dir]["found"] = True
-                                rows[parent_for_dir]["count"] += 1
-                                if len(rows[parent_for_dir]["items"]) < max_items_per_parent:
-                                    rows[parent_for_dir]["items"].append({
-                                        "kind": "folder",
-                                        "file_name": folder_name,
-                                        "parent_folder": Path(dirpath).parent.name,
-                                        "full_path": dirpath,
-                                    })
+                        # company/year checks happen on full path string
+                        pl = dirpath.lower()
+                        if (not company_l or company_l in pl) and (not year_l or year_l in pl):
+                            part[parent_for_dir]["count"] += 1
+                            if len(part[parent_for_dir]["items"]) < max_items_per_parent:
+                                part[parent_for_dir]["items"].append({
+                                    "kind": "folder",
+                                    "file_name": folder_name,
+                                    "parent_folder": folder_parent,
+                                    "full_path": dirpath,
+                                })
 
             # file matches
-            for fname in filenames:
-                full = os.path.join(dirpath, fname)
-                if _passes_filters_file(fname, full, q, company, year, month):
-                    parent_for_file = _find_parent_in_path(full, parent_names_lower)
-                    if parent_for_file:
-                        rows[parent_for_file]["found"] = True
-                        rows[parent_for_file]["count"] += 1
-                        if len(rows[parent_for_file]["items"]) < max_items_per_parent:
-                            rows[parent_for_file]["items"].append({
-                                "kind": "file",
-                                "file_name": fname,
-                                "parent_folder": Path(dirpath).name,
-                                "full_path": full,
-                            })
+            for entry in files:
+                fname = entry.name
+                parent_for_file = dir_parent or parent_names_lower.get(fname.lower())
+                if not parent_for_file:
+                    continue
+                full = entry.path
+                if file_ok(fname, full):
+                    part[parent_for_file]["count"] += 1
+                    if len(part[parent_for_file]["items"]) < max_items_per_parent:
+                        part[parent_for_file]["items"].append({
+                            "kind": "file",
+                            "file_name": fname,
+                            "parent_folder": folder_name,
+                            "full_path": full,
+                        })
+        return part
+
+    # Merge in scope order: the kept items are the first ones in walk order,
+    # as with a single sequential walk
+    for part in _map_scopes(scan, roots_to_walk):
+        for p in parents_order:
+            row, got = rows[p], part[p]
+            row["present"] = row["present"] or got["present"]
+            if got["count"]:
+                row["found"] = True
+                row["count"] += got["count"]
+                row["items"].extend(got["items"][:max_items_per_parent - len(row["items"])])
 
     # Ensure items are sorted (folders first, then files by name)
     for p in parents_order:
         items = rows[p]["items"]
-        items.sort(key=lambda r: (r.get("kind") != "folder", r["file_name"].lower()))
+        items.sort(key=_item_sort_key)
 
     # Return in fixed order
     return {"rows": [rows[p] for p in parents_order]}
@@ -381,56 +623,64 @@ def coverage_files_for_parent(
 
     month = _norm_month(month)
     q = (query or "").strip()
+    file_ok = _file_filter(q, company, year, month)
+    q_l, company_l = q.lower(), (company or "").lower()
+    # year only filters the path when no month is set
+    year_l = str(year).lower() if year and not month else ""
 
     items: List[Dict] = []
     roots_to_walk = _enumerate_effective_roots(roots, year, month)
     if not roots_to_walk:
         return {"parent": parent_canon, "items": []}
 
+    parent_of = _parent_resolver(parent_lower_map)
     for root in roots_to_walk:
         if not os.path.exists(root):
             continue
-        for dirpath, dirnames, filenames in os.walk(root):
+        for dirpath, dirnames, files in _scan_tree(root):
+            folder_name, folder_parent = _dir_names(dirpath)
+            dir_parent = parent_of(dirpath)
+
             # Folder hits under this parent
-            if q:
-                folder_name = Path(dirpath).name
-                if q.lower() in folder_name.lower():
+            if q_l:
+                if q_l in folder_name.lower():
                     # Is this path under our target parent?
-                    canon = _find_parent_in_path(dirpath, parent_lower_map)
-                    if canon == parent_canon:
-                        if _month_ok_for_folder(dirpath, month, year):
-                            pl = dirpath.lower()
-                            if (not company or company.lower() in pl) and (not year or month or str(year).lower() in pl):
-                                items.append({
-                                    "kind": "folder",
-                                    "file_name": folder_name,
-                                    "parent_folder": Path(dirpath).parent.name,
-                                    "full_path": dirpath,
-                                })
-                                if len(items) >= max_items:
-                                    break
-
-            # File hits
-            for fname in filenames:
-                full = os.path.join(dirpath, fname)
-                if _passes_filters_file(fname, full, q, company, year, month):
-                    canon = _find_parent_in_path(full, parent_lower_map)
-                    if canon == parent_canon:
-                        items.append({
-                            "kind": "file",
-                            "file_name": fname,
-                            "parent_folder": Path(dirpath).name,
-                            "full_path": full,
-                        })
-                        if len(items) >= max_items:
-                            break
+                    if dir_parent == parent_canon:
+                        pl = dirpath.lower()
+                        if (not company_l or company_l in pl) and (not year_l or year_l in pl):
+                            items.append({
+                                "kind": "folder",
+                                "file_name": folder_name,
+                                "parent_folder": folder_parent,
+                                "full_path": dirpath,
+                            })
+                            if len(items) >= max_items:
+                                break
+
+            # File hits (another parent's subtree has none: skip it wholesale)
+            if dir_parent is not None and dir_parent != parent_canon:
+                files = ()
+            for entry in files:
+                fname = entry.name
+                if dir_parent is None and parent_lower_map.get(fname.lower()) != parent_canon:
+                    continue
+                full = entry.path
+                if file_ok(fname, full):
+                    items.append({
+                        "kind": "file",
+                        "file_name": fname,
+                        "parent_folder": folder_name,
+                        "full_path": full,
+                    })
+                    if len(items) >= max_items:
+                        break
 
             if len(items) >= max_items:
                 break
         if len(items) >= max_items:
             break
 
-    items.sort(key=lambda r: (r.get("kind") != "folder", r["file_name"].lower()))
+    items.sort(key=_item_sort_key)
     return {"parent": parent_canon, "items": items}
 
 
@@ -478,38 +728,61 @@ def monthly_coverage(
             "missing": list(parents_order),
         }
 
-    for root in roots_to_walk:
+    def scan(root: str) -> Dict[str, List[Dict]]:
+        part: Dict[str, List[Dict]] = {p: [] for p in parents_order}
         if not os.path.exists(root):
-            continue
-
-        for dirpath, dirnames, filenames in os.walk(root):
-            for fname in filenames:
-                full = os.path.join(dirpath, fname)
-                # company filter (substring on full path)
-                if company and company.lower() not in full.lower():
-                    continue
-
-                # month filter (defensive; scope should already constrain)
-                if not _month_ok_for_file(full, m, year):
-                    continue
-
-                canon_parent = _find_parent_in_path(full, parent_lower)
+            return part
+        # per scope (the filter keeps per-directory state); no query, and
+        # year is a scope-only filter here
+        file_ok = _file_filter("", company, None, m)
+        parent_of = _parent_resolver(parent_lower)
+        # count is len(items) here, so once every bucket is full nothing
+        # further down the walk can change the result
+        open_buckets = len(part)
+
+        for dirpath, dirnames, files in _scan_tree(root):
+            if not open_buckets:
+                break
+            folder_name = _dir_names(dirpath)[0]
+            dir_parent = parent_of(dirpath)
+            if dir_parent and len(part[dir_parent]) >= max_items_per_parent:
+                continue  # every file here would go to a full bucket
+            for entry in files:
+                fname = entry.name
+                canon_parent = dir_parent or parent_lower.get(fname.lower())
                 if not canon_parent:
                     continue  # skip files that are not under a known parent folder
 
-                bucket = grouped[canon_parent]
+                # full bucket: skip before the path filter and dict
+                bucket = part[canon_parent]
                 if len(bucket) >= max_items_per_parent:
                     continue
+
+                full = entry.path
+                # company filter (substring on full path); the month scope
+                # already constrains the folders
+                if not file_ok(fname, full):
+                    continue
+
                 bucket.append({
                     "kind": "file",
                     "file_name": fname,
-                    "parent_folder": Path(dirpath).name,
+                    "parent_folder": folder_name,
                     "full_path": full,
                 })
+                if len(bucket) == max_items_per_parent:
+                    open_buckets -= 1
+        return part
+
+    # Scopes walked concurrently, merged in scope order (cap keeps the first in walk order)
+    for part in _map_scopes(scan, roots_to_walk):
+        for p in parents_order:
+            bucket = grouped[p]
+            bucket.extend(part[p][:max_items_per_parent - len(bucket)])
 
     # Sort items within each parent by file name
     for p in parents_order:
-        grouped[p].sort(key=lambda r: r["file_name"].lower())
+        grouped[p].sort(key=_name_sort_key)
 
     available = [
         {"parent": p, "count": len(grouped[p]), "items": grouped[p]}
@@ -526,6 +799,91 @@ def monthly_coverage(
 
 # ---------- MULTI-EXP MISSING REPORT (NEW) ----------
 
+_EXP_IN_NAME_RX = re.compile(r"exp-(\d+)")
+
+def _exp_code_finder(exps: List[str]) -> Callable[[str], List[str]]:
+    """
+    codes_in(name_l): the codes (normalized 'EXP-<digits>') that occur as a
+    substring of the lowercased name, in one regex scan whatever the number of
+    codes. 'exp-<digits>' occurs iff some 'exp-' in the name is followed by a
+    digit run starting with <digits>, so each run is checked by its prefixes
+    (EXP-1 still matches inside EXP-12, like the plain substring test).
+    """
+    by_digits = {e[4:]: e for e in exps}
+
+    def codes_in(name_l: str) -> List[str]:
+        out: Dict[str, None] = {}
+        for m in _EXP_IN_NAME_RX.finditer(name_l):
+            run = m.group(1)
+            for k in range(1, len(run) + 1):
+                e = by_digits.get(run[:k])
+                if e is not None:
+                    out[e] = None
+        return list(out)
+
+    return codes_in
+
+
+def _exp_parents_found(
+    parents_order: List[str],
+    roots: List[str],
+    exps: List[str],
+    year: Optional[str],
+    month: Optional[str],
+    company: Optional[str],
+) -> Dict[str, set]:
+    """
+    For each EXP code, the parents coverage_rows(query=exp, ...) would mark
+    found, from a single walk instead of one walk per code. Stops early once
+    every EXP is found under every parent.
+    """
+    found: Dict[str, set] = {e: set() for e in exps}
+    if not exps:
+        return found
+    parent_names_lower = {p.lower(): p for p in parents_order}
+    codes_in = _exp_code_finder(exps)
+    path_ok = _file_filter("", company, year, month)
+    company_l = (company or "").lower()
+    year_l = str(year).lower() if year and not month else ""
+    remaining = len(exps) * len(parents_order)
+
+    parent_of = _parent_resolver(parent_names_lower)
+    for root in _enumerate_effective_roots(roots, year, month):
+        if not os.path.exists(root):
+            continue
+        for dirpath, dirnames, files in _scan_tree(root):
+            dir_parent = parent_of(dirpath)
+
+            # folder hits count for the parent in the folder's own path
+            codes = codes_in(_dir_names(dirpath)[0].lower()) if dir_parent else ()
+            if codes:
+                pl = dirpath.lower()
+                if (not company_l or company_l in pl) and (not year_l or year_l in pl):
+                    for e in codes:
+                        if dir_parent not in found[e]:
+                            found[e].add(dir_parent)
+                            remaining -= 1
+
+            for entry in files:
+                fname = entry.name
+                name_l = fname.lower()
+                codes = codes_in(name_l)
+                if not codes:
+                    continue
+                parent = dir_parent or parent_names_lower.get(name_l)
+                if not parent:
+                    continue
+                hits = [e for e in codes if parent not in found[e]]
+                if hits and path_ok(fname, entry.path):
+                    for e in hits:
+                        found[e].add(parent)
+                    remaining -= len(hits)
+
+            if not remaining:
+                return found
+    return found
+
+
 def multi_exp_missing(
     parents_order: List[str],
     roots: List[str],
@@ -581,20 +939,13 @@ def multi_exp_missing(
     results: List[Dict] = []
     missing_counts = {p: 0 for p in parents_order}
 
+    # One walk answers every EXP (coverage_rows' found flags, per EXP)
+    found_by_exp = _exp_parents_found(parents_order, roots, normalized, year, m, company)
+
     for exp in normalized:
-        # Reuse coverage_rows logic for a single EXP
-        rows = coverage_rows(
-            parents_order=parents_order,
-            roots=roots,
-            query=exp,
-            year=year,
-            month=m,
-            company=company,
-            max_items_per_parent=1,  # we only care about found/missing flags
-        ).get("rows", [])
-
-        missing = [r["parent"] for r in rows if not r.get("found", False)]
-        found   = [r["parent"] for r in rows if r.get("found", False)]
+        hit = found_by_exp[exp]
+        missing = [p for p in parents_order if p not in hit]
+        found   = [p for p in parents_order if p in hit]
 
         # Tally summary
         for p in missing:
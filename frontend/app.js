@@ -462,12 +462,17 @@ async function onParentTableClick(e){
       let items = [];
       if(viewBtn.dataset.preloaded === "1" && viewBtn._preloadedItems){
         items = viewBtn._preloadedItems;
+        renderChildItems(expandRow, items);
       }else{
-        items = await fetchCoverageFiles(parent);
+        // Rows are appended as NDJSON batches arrive
+        const tbody = expandRow.querySelector('tbody');
+        tbody.innerHTML = "";
+        expandRow.classList.remove('hidden');
+        items = await fetchCoverageFiles(parent, batch => appendChildItems(tbody, batch));
+        if(!items.length) renderChildItems(expandRow, items);
         viewBtn.dataset.preloaded = "1";
         viewBtn._preloadedItems = items;
       }
-      renderChildItems(expandRow, items);
       expandRow.classList.remove('hidden');
       viewBtn.setAttribute('aria-expanded', 'true');
       viewBtn.textContent = 'Hide files';
@@ -495,7 +500,7 @@ function findExpandRow(parent){
   return els.parentRows.querySelector(`tr.expand-row[data-parent="${cssEscape(parent)}"]`);
 }
 
-async function fetchCoverageFiles(parent){
+async function fetchCoverageFiles(parent, onBatch){
   const numberPart = (els.query.value || "").trim();
   const query = `EXP-${numberPart}`;
 
@@ -508,8 +513,28 @@ async function fetchCoverageFiles(parent){
 
   const res = await fetch(`${API_BASE}/coverage-files?${params.toString()}`);
   if(!res.ok) throw new Error(`coverage-files ${res.status}`);
-  const data = await res.json();
-  return data.items || [];
+  return readNdjson(res, onBatch);
+}
+
+/* Read an NDJSON response incrementally; onBatch gets each parsed chunk of items */
+async function readNdjson(res, onBatch){
+  const items = [];
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buf = "";
+  for(;;){
+    const { value, done } = await reader.read();
+    buf += decoder.decode(value || new Uint8Array(), { stream: !done });
+    const lines = buf.split("\n");
+    buf = done ? "" : lines.pop();
+    const batch = lines.filter(Boolean).map(line => JSON.parse(line));
+    if(batch.length){
+      items.push(...batch);
+      if(onBatch) onBatch(batch);
+    }
+    if(done) break;
+  }
+  return items;
 }
 
 /* === Preview is enabled for BOTH files and folders === */
@@ -524,6 +549,36 @@ function renderChildItems(expandRow, items){
     return;
   }
 
+  appendChildItems(tbody, items);
+}
+
+/* Child rows arrive in walk order (NDJSON batches): each one is inserted at its
+   sorted place (folders first, then name, then path), whatever the arrival order */
+function childSortKey(row){
+  const kind = (row.kind || "file").toLowerCase();
+  return [kind === "folder" ? 0 : 1, (row.file_name || "").toLowerCase(), row.full_path || ""];
+}
+
+function compareChildKeys(a, b){
+  for(let i = 0; i < a.length; i++){
+    if(a[i] < b[i]) return -1;
+    if(a[i] > b[i]) return 1;
+  }
+  return 0;
+}
+
+function insertChildRow(tbody, tr){
+  const rows = tbody.children;
+  let lo = 0, hi = rows.length;
+  while(lo < hi){
+    const mid = (lo + hi) >> 1;
+    if(compareChildKeys(rows[mid]._sortKey, tr._sortKey) <= 0) lo = mid + 1;
+    else hi = mid;
+  }
+  tbody.insertBefore(tr, rows[lo] || null);
+}
+
+function appendChildItems(tbody, items){
   items.forEach(row => {
     const kind = (row.kind || "file").toLowerCase();
     const isFile = kind === "file";
@@ -547,7 +602,8 @@ function renderChildItems(expandRow, items){
       <td>${previewCell}</td>
       <td><button class="btn act-copy" type="button" data-path="${escapeHtmlAttr(fullPath)}">Copy</button></td>
     `;
-    tbody.appendChild(tr);
+    tr._sortKey = childSortKey(row);
+    insertChildRow(tbody, tr);
   });
 }
 
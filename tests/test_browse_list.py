@@ -0,0 +1,36 @@
+from backend import app as app_module
+from backend import indexer
+
+
+def test_walk_paging_resumes_without_nesting(tmp_path):
+    # More pages than the recursion limit: each "load more" resumes the parked walk
+    names = [f"f{i:05}.txt" for i in range(1500)]
+    for name in names:
+        (tmp_path / name).touch()
+    base = str(tmp_path)
+    walk_key = (base, True, "")
+    seen, offset = [], 0
+    while offset is not None:
+        page = app_module._browse_list_page(walk_key, base, True, None, offset, 1, "walk")
+        seen += [row["name"] for row in page["items"]]
+        offset = page["next_offset"]
+    assert sorted(seen) == names
+
+
+def test_walk_and_index_list_the_same_entries(tmp_path):
+    root = tmp_path / "root"
+    (root / "sub" / "deep").mkdir(parents=True)
+    (root / "sub" / "deep" / "a.pdf").touch()
+    (root / "b.txt").touch()
+    (root / ".git").mkdir()
+    (root / ".git" / "HEAD").touch()
+    (root / "link_dir").symlink_to(root / "sub", target_is_directory=True)
+    (root / "link_file").symlink_to(root / "b.txt")
+    (root / "dangling").symlink_to(root / "missing")
+    db = str(tmp_path / "db.sqlite")
+    indexer.build_index(db, [str(root)])
+
+    walked = {e.path for e in app_module._parallel_scandir(str(root))}
+    indexed = set(indexer.list_under(db, str(root), None, 0, 1000))
+    assert walked == indexed
+    assert str(root / "link_dir") not in walked
@@ -0,0 +1,16 @@
+import pytest
+
+from backend.mime_types import guess_type
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("report.pdf", "application/pdf"),
+    ("report.pdf.gz", "application/pdf"),
+    ("REPORT.PDF.GZ", "application/pdf"),
+    ("data.csv.xz", "text/csv"),
+    ("backup.tar.gz", "application/x-tar"),
+    ("archive.gz", "application/octet-stream"),
+    ("README", "application/octet-stream"),
+])
+def test_guess_type(name, expected):
+    assert guess_type(name) == expected
@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import app as app_module
+
+BODY = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "doc.pdf").write_bytes(BODY)
+    monkeypatch.setattr(app_module, "_NORM_ROOTS", (app_module._norm_root(str(tmp_path)),))
+    app_module._path_allowed.cache_clear()
+    # no `with`: startup hooks (index refresher) stay off
+    yield TestClient(app_module.app), str(tmp_path / "doc.pdf")
+    app_module._path_allowed.cache_clear()
+
+
+def test_preview_full(client):
+    c, path = client
+    r = c.get("/preview", params={"path": path})
+    assert r.status_code == 200
+    assert r.content == BODY
+    assert r.headers["content-type"] == "application/pdf"
+    assert r.headers["accept-ranges"] == "bytes"
+    assert r.headers["etag"]
+
+
+def test_preview_not_modified(client):
+    c, path = client
+    etag = c.get("/preview", params={"path": path}).headers["etag"]
+    r = c.get("/preview", params={"path": path}, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+
+
+def test_preview_range(client):
+    c, path = client
+    r = c.get("/preview", params={"path": path}, headers={"Range": "bytes=10-19"})
+    assert r.status_code == 206
+    assert r.content == BODY[10:20]
+    assert r.headers["content-range"] == f"bytes 10-19/{len(BODY)}"
+
+
+def test_preview_invalid_range_serves_full_file(client):
+    c, path = client
+    r = c.get("/preview", params={"path": path}, headers={"Range": "bytes=5-3"})
+    assert r.status_code == 200
+    assert r.content == BODY
+
+
+def test_preview_unsatisfiable_range(client):
+    c, path = client
+    r = c.get("/preview", params={"path": path}, headers={"Range": f"bytes={len(BODY)}-"})
+    assert r.status_code == 416